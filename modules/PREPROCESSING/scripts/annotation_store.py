@@ -0,0 +1,399 @@
+"""
+##############################################################################
+#
+#   Columnar, memory-mappable store of a genomic annotation.
+#
+#   A GTF file is compiled once into a directory of flat numpy arrays
+#   (integer coordinates, categorical chromosomes/biotypes, CSR-style links
+#   gene -> transcripts -> exons and per-chromosome gene offsets).
+#   Loading the store only maps the files into memory.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import re
+import json
+import gzip
+import numpy as np
+
+STORE_VERSION = 1
+
+STRAND_CODES = {"+": 1, "-": -1, ".": 0}
+STRAND_SYMBOLS = {1: "+", -1: "-", 0: "."}
+
+ATTRIBUTE_PATTERN = re.compile(r'\s*(\S+)\s+"?([^";]*)"?;?')
+
+
+def parse_attributes(attributes_string):
+    """
+    Parse the 9th GTF column into a dictionary
+    (repeated keys, e.g. 'tag', are collected in a list)
+    """
+    attributes = {}
+    for field in attributes_string.strip().split(";"):
+        match = ATTRIBUTE_PATTERN.match(field)
+        if match is None:
+            continue
+        key, value = match.group(1), match.group(2)
+        if key == "tag":
+            attributes.setdefault("tag", []).append(value)
+        else:
+            attributes[key] = value
+    return attributes
+
+
+class Categories:
+    """
+    Mapping of categorical values (chromosomes, biotypes...) to integer codes
+    """
+
+    def __init__(self, values=None):
+        self.values = list(values) if values is not None else []
+        self.codes = {v: i for i, v in enumerate(self.values)}
+
+    def encode(self, value):
+        if value not in self.codes:
+            self.codes[value] = len(self.values)
+            self.values.append(value)
+        return self.codes[value]
+
+    def __getitem__(self, code):
+        return self.values[code]
+
+    def __len__(self):
+        return len(self.values)
+
+
+class StringColumn:
+    """
+    Memory-mapped column of variable-length strings:
+    one blob of UTF-8 bytes plus int64 offsets (n+1)
+    """
+
+    def __init__(self, path_prefix):
+        self.offsets = np.load(path_prefix + ".offsets.npy", mmap_mode="r")
+        if os.path.getsize(path_prefix + ".bin") > 0:
+            self.blob = np.memmap(path_prefix + ".bin", dtype=np.uint8, mode="r")
+        else:
+            self.blob = np.zeros(0, dtype=np.uint8)
+        self._lookup = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.blob[self.offsets[i]:self.offsets[i + 1]]).decode("utf-8")
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def index(self, value):
+        """Position of a value in the column (lookup built on first use)."""
+        if self._lookup is None:
+            self._lookup = {v: i for i, v in enumerate(self)}
+        return self._lookup[value]
+
+    @staticmethod
+    def write(path_prefix, values):
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        with open(path_prefix + ".bin", "wb") as blob:
+            position = 0
+            for i, value in enumerate(values):
+                encoded = value.encode("utf-8")
+                blob.write(encoded)
+                position += len(encoded)
+                offsets[i + 1] = position
+        np.save(path_prefix + ".offsets.npy", offsets)
+
+
+##############################################################################
+
+
+class _GTFRecords:
+    """Python-side accumulator used only during the compilation."""
+
+    def __init__(self):
+        self.chroms = Categories()
+        self.sources = Categories()
+        self.gene_biotypes = Categories()
+        self.transcript_biotypes = Categories()
+        self.header = []
+        self.genes = []
+        self.gene_index = {}
+        self.transcripts = []
+        self.transcript_index = {}
+
+    def gene(self, gene_id, chrom, source, strand, start, end, attributes,
+             attributes_string):
+        if gene_id in self.gene_index:
+            return self.genes[self.gene_index[gene_id]]
+        gene = {
+            "id": gene_id,
+            "name": attributes.get("gene_name", gene_id),
+            "chrom": self.chroms.encode(chrom),
+            "source": self.sources.encode(source),
+            "strand": STRAND_CODES.get(strand, 0),
+            "start": start,
+            "end": end,
+            "biotype": self.gene_biotypes.encode(
+                attributes.get("gene_biotype", attributes.get("gene_type", ""))
+            ),
+            "attributes": attributes_string,
+            "transcripts": [],
+        }
+        self.gene_index[gene_id] = len(self.genes)
+        self.genes.append(gene)
+        return gene
+
+    def transcript(self, transcript_id, gene, start, end, attributes):
+        if transcript_id in self.transcript_index:
+            return self.transcripts[self.transcript_index[transcript_id]]
+        transcript = {
+            "id": transcript_id,
+            "name": attributes.get("transcript_name", transcript_id),
+            "gene": gene,
+            "start": start,
+            "end": end,
+            "biotype": self.transcript_biotypes.encode(
+                attributes.get(
+                    "transcript_biotype", attributes.get("transcript_type", "")
+                )
+            ),
+            "tags": ",".join(attributes.get("tag", [])),
+            "exons": [],
+        }
+        self.transcript_index[transcript_id] = len(self.transcripts)
+        self.transcripts.append(transcript)
+        gene["transcripts"].append(transcript)
+        return transcript
+
+
+def _open_text(path):
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path, "r")
+
+
+def compile_gtf(gtf, store_dir):
+    """
+    Parse a GTF file once and write the annotation store into store_dir
+    """
+    records = _GTFRecords()
+    with _open_text(gtf) as f:
+        for line in f:
+            if line.startswith("#"):
+                if line.startswith(("##", "#!")):
+                    records.header.append(line.rstrip("\n"))
+                continue
+            row = line.rstrip("\n").split("\t")
+            if len(row) < 9:
+                continue
+            feature = row[2]
+            if feature not in ("gene", "transcript", "exon"):
+                continue
+            chrom, source, strand = row[0], row[1], row[6]
+            start, end = int(row[3]), int(row[4])
+            attributes = parse_attributes(row[8])
+            gene_id = attributes["gene_id"]
+            if feature == "gene":
+                gene = records.gene(gene_id, chrom, source, strand, start, end,
+                                    attributes, row[8])
+                # the gene line is authoritative for the gene coordinates
+                gene["start"], gene["end"] = start, end
+                gene["attributes"] = row[8]
+                continue
+            # transcripts/exons without a preceding gene line
+            gene = records.gene(gene_id, chrom, source, strand, start, end,
+                                attributes, row[8])
+            transcript = records.transcript(
+                attributes["transcript_id"], gene, start, end, attributes
+            )
+            if feature == "transcript":
+                transcript["start"], transcript["end"] = start, end
+                continue
+            exon_number = attributes.get("exon_number")
+            exon_number = (int(exon_number) if exon_number is not None
+                           else len(transcript["exons"]) + 1)
+            transcript["exons"].append((
+                start,
+                end,
+                exon_number,
+                attributes.get("exon_id", str(exon_number)),
+            ))
+            transcript["start"] = min(transcript["start"], start)
+            transcript["end"] = max(transcript["end"], end)
+            gene["start"] = min(gene["start"], start)
+            gene["end"] = max(gene["end"], end)
+
+    _write_store(records, gtf, store_dir)
+
+
+def _write_store(records, gtf, store_dir):
+    """Flatten the parsed records into columns and save them."""
+    os.makedirs(store_dir, exist_ok=True)
+
+    # genes grouped per chromosome (stable: keeps the GTF order within one)
+    genes = sorted(records.genes, key=lambda g: g["chrom"])
+    transcripts = [t for g in genes for t in g["transcripts"]]
+    exons = [(i, e) for i, t in enumerate(transcripts) for e in t["exons"]]
+
+    gene_chrom = np.array([g["chrom"] for g in genes], dtype=np.int32)
+    chrom_gene_offsets = np.searchsorted(
+        gene_chrom, np.arange(len(records.chroms) + 1)
+    ).astype(np.int64)
+
+    columns = {
+        "gene_chrom": gene_chrom.astype(np.int16),
+        "gene_source": np.array([g["source"] for g in genes], dtype=np.int16),
+        "gene_strand": np.array([g["strand"] for g in genes], dtype=np.int8),
+        "gene_start": np.array([g["start"] for g in genes], dtype=np.int32),
+        "gene_end": np.array([g["end"] for g in genes], dtype=np.int32),
+        "gene_biotype": np.array([g["biotype"] for g in genes], dtype=np.int16),
+        "gene_transcript_offsets": np.cumsum(
+            [0] + [len(g["transcripts"]) for g in genes]
+        ).astype(np.int64),
+        "transcript_gene": np.repeat(
+            np.arange(len(genes), dtype=np.int32),
+            [len(g["transcripts"]) for g in genes]
+        ),
+        "transcript_start": np.array(
+            [t["start"] for t in transcripts], dtype=np.int32),
+        "transcript_end": np.array(
+            [t["end"] for t in transcripts], dtype=np.int32),
+        "transcript_biotype": np.array(
+            [t["biotype"] for t in transcripts], dtype=np.int16),
+        "transcript_exon_offsets": np.cumsum(
+            [0] + [len(t["exons"]) for t in transcripts]
+        ).astype(np.int64),
+        "exon_transcript": np.array([i for i, _ in exons], dtype=np.int32),
+        "exon_start": np.array([e[0] for _, e in exons], dtype=np.int32),
+        "exon_end": np.array([e[1] for _, e in exons], dtype=np.int32),
+        "exon_number": np.array([e[2] for _, e in exons], dtype=np.int32),
+        "chrom_gene_offsets": chrom_gene_offsets,
+    }
+    for name, values in columns.items():
+        np.save(os.path.join(store_dir, name + ".npy"), values)
+
+    strings = {
+        "gene_id": [g["id"] for g in genes],
+        "gene_name": [g["name"] for g in genes],
+        "gene_attributes": [g["attributes"] for g in genes],
+        "transcript_id": [t["id"] for t in transcripts],
+        "transcript_name": [t["name"] for t in transcripts],
+        "transcript_tags": [t["tags"] for t in transcripts],
+        "exon_id": [e[3] for _, e in exons],
+    }
+    for name, values in strings.items():
+        StringColumn.write(os.path.join(store_dir, name), values)
+
+    meta = {
+        "version": STORE_VERSION,
+        "source_gtf": os.path.abspath(gtf),
+        "header": records.header,
+        "chroms": records.chroms.values,
+        "sources": records.sources.values,
+        "gene_biotypes": records.gene_biotypes.values,
+        "transcript_biotypes": records.transcript_biotypes.values,
+        "counts": {
+            "genes": len(genes),
+            "transcripts": len(transcripts),
+            "exons": len(exons),
+        },
+    }
+    with open(os.path.join(store_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=1)
+
+
+##############################################################################
+
+
+class AnnotationStore:
+    """
+    Read-only view of a compiled annotation (all columns memory-mapped)
+    """
+
+    def __init__(self, store_dir):
+        with open(os.path.join(store_dir, "meta.json")) as f:
+            self.meta = json.load(f)
+        if self.meta["version"] != STORE_VERSION:
+            raise ValueError(
+                "Unsupported annotation store version: "
+                + str(self.meta["version"])
+            )
+        self.store_dir = store_dir
+        self.header = self.meta["header"]
+        self.chroms = Categories(self.meta["chroms"])
+        self.sources = Categories(self.meta["sources"])
+        self.gene_biotypes = Categories(self.meta["gene_biotypes"])
+        self.transcript_biotypes = Categories(self.meta["transcript_biotypes"])
+        for name in os.listdir(store_dir):
+            if name.endswith(".npy") and not name.endswith(".offsets.npy"):
+                setattr(self, name[:-4], np.load(
+                    os.path.join(store_dir, name), mmap_mode="r"))
+            elif name.endswith(".bin"):
+                setattr(self, name[:-4],
+                        StringColumn(os.path.join(store_dir, name[:-4])))
+
+    @property
+    def n_genes(self):
+        return len(self.gene_start)
+
+    @property
+    def n_transcripts(self):
+        return len(self.transcript_start)
+
+    def genes_on_chrom(self, chrom):
+        """Slice of gene indices located on a given chromosome."""
+        if chrom not in self.chroms.codes:
+            return slice(0, 0)
+        code = self.chroms.codes[chrom]
+        return slice(int(self.chrom_gene_offsets[code]),
+                     int(self.chrom_gene_offsets[code + 1]))
+
+    def transcripts_of_gene(self, gene):
+        return range(int(self.gene_transcript_offsets[gene]),
+                     int(self.gene_transcript_offsets[gene + 1]))
+
+    def exons_of_transcript(self, transcript):
+        return range(int(self.transcript_exon_offsets[transcript]),
+                     int(self.transcript_exon_offsets[transcript + 1]))
+
+    def transcripts_of_biotypes(self, biotypes):
+        """Indices of transcripts of the requested biotypes."""
+        codes = [self.transcript_biotypes.codes[b] for b in biotypes
+                 if b in self.transcript_biotypes.codes]
+        return np.flatnonzero(np.isin(self.transcript_biotype, codes))
+
+    def transcript_to_bed12(self, transcript):
+        """
+        BED12 line of a transcript (same layout as zgtf's
+        transcript_exons_to_bed12; 0-based, half-open coordinates)
+        """
+        exons = self.exons_of_transcript(transcript)
+        starts = np.asarray(self.exon_start[exons.start:exons.stop]) - 1
+        ends = np.asarray(self.exon_end[exons.start:exons.stop])
+        order = np.argsort(starts, kind="mergesort")
+        starts, ends = starts[order], ends[order]
+        tr_start = int(min(starts[0], ends[0], starts[-1], ends[-1]))
+        tr_end = int(max(starts[0], ends[0], starts[-1], ends[-1]))
+        gene = int(self.transcript_gene[transcript])
+        return "\t".join([
+            self.chroms[int(self.gene_chrom[gene])],
+            str(tr_start),
+            str(tr_end),
+            self.transcript_id[transcript],
+            "1",
+            STRAND_SYMBOLS[int(self.gene_strand[gene])],
+            str(tr_start),
+            str(tr_end),
+            "0",
+            str(len(starts)),
+            ",".join(str(e - s) for s, e in zip(starts, ends)) + ",",
+            ",".join(str(s - tr_start) for s in starts) + ",",
+        ])
@@ -0,0 +1,128 @@
+"""
+##############################################################################
+#
+#   Assemble the quality-filtered design table from per-sample QC verdicts.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+from qc_checks import read_verdict, PASS
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--verdicts",
+        dest="verdicts",
+        required=True,
+        nargs="+",
+        help="Per-sample QC verdicts in a TSV format.",
+    )
+    parser.add_argument(
+        "--design-table-in",
+        dest="input",
+        required=True,
+        help="Original design table in a TSV format.",
+    )
+    parser.add_argument(
+        "--design-table-out",
+        dest="output",
+        required=True,
+        help="Filtered design table in a TSV format.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def main():
+    """Main body of the script."""
+
+    # read the original design table
+    design_table_in = pd.read_csv(options.input, sep="\t", index_col=0)
+
+    # collect samples which passed the quality control
+    passed = set()
+    for path in options.verdicts:
+        sample, verdict = read_verdict(path)
+        if verdict == PASS:
+            passed.add(sample)
+
+    # filter the design table
+    samples_to_keep = [s for s in design_table_in.index.values if s in passed]
+    design_table_out = design_table_in.loc[samples_to_keep].copy()
+    design_table_out.to_csv(options.output, sep="\t")
+
+    # the filtered table is already saved, now check if there are any samples left after qc
+    # if not: raise exception to shutdown the whole pipeline (keeping the output file)
+    if len(samples_to_keep) < 2:
+        errmsg = "Less than two samples passed the quality control step. Further processing is not possible"
+        raise RuntimeWarning(errmsg)
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
@@ -0,0 +1,115 @@
+"""
+##############################################################################
+#
+#   Per-sample, per-strand read coverage cache of sorted and indexed
+#   alignments (see coverage_cache.py for the format). The chromosomes are
+#   processed in parallel.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+from coverage_cache import build_coverage_cache
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--bam",
+        dest="bam",
+        required=True,
+        help="Sorted and indexed alignments of the sample.",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="threads",
+        type=int,
+        default=1,
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        required=True,
+        help="Output: directory of the coverage cache.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def main():
+    """Main body of the script."""
+
+    chromosomes, runs = build_coverage_cache(
+        options.bam, options.output_dir, options.threads
+    )
+    logger.info(
+        "Coverage of {} chromosomes cached in {} runs".format(chromosomes, runs)
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
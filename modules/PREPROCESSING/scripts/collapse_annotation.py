@@ -13,6 +13,7 @@ from bx.intervals.intersection import IntervalTree
 import argparse
 import os
 import gzip
+from annotation_store import AnnotationStore, STRAND_SYMBOLS
 
 
 class Exon:
@@ -48,6 +49,11 @@ class Annotation:
     def __init__(self, gtfpath):
         """Parse GTF and construct gene/transcript/exon hierarchy"""
 
+        self.header = None
+        if os.path.isdir(gtfpath):
+            self.load_store(gtfpath)
+            return
+
         if gtfpath.endswith('.gtf.gz'):
             opener = gzip.open(gtfpath, 'rt')
         else:
@@ -108,6 +114,37 @@ class Annotation:
 
         self.genes = np.array(self.genes)
 
+    def load_store(self, store_dir):
+        """Construct gene/transcript/exon hierarchy from a compiled annotation store"""
+        store = AnnotationStore(store_dir)
+        self.header = store.header
+
+        self.genes = []
+        for gi in range(store.n_genes):
+            attributes_string = store.gene_attributes[gi].replace('_biotype', '_type')
+            g = Gene(store.gene_id[gi], store.gene_name[gi],
+                     store.gene_biotypes[int(store.gene_biotype[gi])],
+                     store.chroms[int(store.gene_chrom[gi])],
+                     STRAND_SYMBOLS[int(store.gene_strand[gi])],
+                     int(store.gene_start[gi]), int(store.gene_end[gi]))
+            g.source = store.sources[int(store.gene_source[gi])]
+            g.phase = '.'
+            g.attributes_string = attributes_string
+            for ti in store.transcripts_of_gene(gi):
+                t = Transcript(store.transcript_id[ti], store.transcript_name[ti],
+                               store.transcript_biotypes[int(store.transcript_biotype[ti])],
+                               g, int(store.transcript_start[ti]), int(store.transcript_end[ti]))
+                tags = store.transcript_tags[ti]
+                t.attributes = {'tags': tags.split(',')} if tags else {}
+                for ei in store.exons_of_transcript(ti):
+                    t.exons.append(Exon(store.exon_id[ei], store.exon_number[ei], t,
+                                        int(store.exon_start[ei]), int(store.exon_end[ei])))
+                g.transcripts.append(t)
+            self.genes.append(g)
+        print('Loaded annotation store: {0:d} genes'.format(len(self.genes)))
+
+        self.genes = np.array(self.genes)
+
 
 def interval_union(intervals):
     """
@@ -180,6 +217,22 @@ def add_transcript_attributes(attributes_string):
     return '; '.join([k+' '+attr_dict[k] for k in attribute_order] + opt)+';'
 
 
+def read_header(transcript_gtf):
+    """Header lines ('##'/'#!') of a GTF file"""
+    if transcript_gtf.endswith('.gtf.gz'):
+        opener = gzip.open(transcript_gtf, 'rt')
+    else:
+        opener = open(transcript_gtf, 'r')
+    header = []
+    with opener as input_gtf:
+        for line in input_gtf:
+            if line[:2]=='##' or line[:2]=='#!':
+                header.append(line.rstrip('\n'))
+            else:
+                break
+    return header
+
+
 def collapse_annotation(annot, transcript_gtf, collapsed_gtf, blacklist=set(), collapse_only=False):
     """
     Collapse transcripts into a single gene model; remove overlapping intervals
@@ -241,19 +294,14 @@ def collapse_annotation(annot, transcript_gtf, collapsed_gtf, blacklist=set(), c
         new_coord_dict = merged_coord_dict
 
     # 5) write to GTF
-    if transcript_gtf.endswith('.gtf.gz'):
-        opener = gzip.open(transcript_gtf, 'rt')
-    else:
-        opener = open(transcript_gtf, 'r')
+    header = annot.header if annot.header is not None else read_header(transcript_gtf)
 
-    with open(collapsed_gtf, 'w') as output_gtf, opener as input_gtf:
+    with open(collapsed_gtf, 'w') as output_gtf:
         # copy header
-        for line in input_gtf:
-            if line[:2]=='##' or line[:2]=='#!':
-                output_gtf.write(line)
-                comment = line[:2]
-            else:
-                break
+        comment = '##'
+        for line in header:
+            output_gtf.write(line+'\n')
+            comment = line[:2]
         output_gtf.write(comment+'collapsed version generated by GTEx pipeline\n')
         for g in annot.genes:
             if g.id in new_coord_dict:
@@ -276,7 +324,7 @@ def collapse_annotation(annot, transcript_gtf, collapsed_gtf, blacklist=set(), c
 if __name__=='__main__':
 
     parser = argparse.ArgumentParser(description='Collapse isoforms into single transcript per gene and remove overlapping intervals between genes')
-    parser.add_argument('transcript_gtf', help='Transcript annotation in GTF format')
+    parser.add_argument('transcript_gtf', help='Transcript annotation in GTF format or a compiled annotation store directory')
     parser.add_argument('output_gtf', help='Name of the output file')
     parser.add_argument('--transcript_blacklist', help='List of transcripts to exclude (e.g., unannotated readthroughs)')
     parser.add_argument('--collapse_only', action='store_true', help='')
@@ -0,0 +1,110 @@
+"""
+##############################################################################
+#
+#   Compile a genomic annotation (GTF) into a columnar, memory-mappable
+#   annotation store shared by the python stages of the workflow.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+from annotation_store import compile_gtf, AnnotationStore
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--gtf",
+        dest="gtf",
+        required=True,
+        help="Genomic annotation in GTF format (optionally gzipped).",
+    )
+    parser.add_argument(
+        "--store-dir",
+        dest="store_dir",
+        required=True,
+        help="Output directory for the compiled annotation store.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def main():
+    """Main body of the script."""
+
+    compile_gtf(options.gtf, options.store_dir)
+
+    # sanity check: the store can be loaded back
+    store = AnnotationStore(options.store_dir)
+    logger.info(
+        "Compiled {} genes, {} transcripts on {} chromosomes".format(
+            store.n_genes, store.n_transcripts, len(store.chroms)
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
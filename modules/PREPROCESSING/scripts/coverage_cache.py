@@ -0,0 +1,203 @@
+"""
+##############################################################################
+#
+#   Per-sample, per-strand read coverage computed once from the alignments.
+#
+#   The coverage of every chromosome and strand is stored run-length
+#   encoded: sorted, chromosome-local run starts (int64) and the coverage
+#   of every run (uint32), concatenated over the chromosomes into one pair
+#   of .npy files per strand. index.json keeps the length of every
+#   chromosome and the slice of its runs in the arrays. The arrays are
+#   memory-mapped on access, so reading a window costs two binary searches
+#   instead of decoding the alignments.
+#
+#   Coverage counts the aligned blocks of the primary, non-duplicate,
+#   QC-passed reads (no deletions, insertions or skipped regions). The
+#   strand is the one of the fragment: the strand of the second mate of a
+#   pair is flipped.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import json
+from array import array
+from multiprocessing import Pool
+import numpy as np
+import pysam
+
+STRANDS = {"+": "plus", "-": "minus"}
+
+
+def chromosome_runs(bam, chromosome):
+    """
+    Coverage runs of both strands of a chromosome:
+    {strand: (run starts, run values)}
+    """
+    events = {strand: (array("q"), array("q")) for strand in STRANDS}
+    with pysam.AlignmentFile(bam, "rb") as alignments:
+        for read in alignments.fetch(chromosome):
+            if (
+                read.is_unmapped
+                or read.is_secondary
+                or read.is_supplementary
+                or read.is_qcfail
+                or read.is_duplicate
+            ):
+                continue
+            strand = "-" if read.is_reverse != read.is_read2 else "+"
+            starts, ends = events[strand]
+            for start, end in read.get_blocks():
+                starts.append(start)
+                ends.append(end)
+
+    runs = {}
+    for strand, (starts, ends) in events.items():
+        positions = np.concatenate([
+            np.frombuffer(starts, dtype=np.int64),
+            np.frombuffer(ends, dtype=np.int64),
+        ])
+        deltas = np.concatenate([
+            np.ones(len(starts), dtype=np.int64),
+            -np.ones(len(ends), dtype=np.int64),
+        ])
+        positions, inverse = np.unique(positions, return_inverse=True)
+        values = np.cumsum(np.bincount(inverse, weights=deltas)).astype(np.int64)
+        # a run starts at every change of the coverage (from 0 at position 0)
+        positions = np.concatenate([[0], positions])
+        values = np.concatenate([[0], values])
+        changes = np.concatenate([[True], values[1:] != values[:-1]])
+        runs[strand] = (
+            positions[changes].astype(np.int64),
+            values[changes].astype(np.uint32),
+        )
+    return runs
+
+
+def _chromosome_runs(arguments):
+    """Pool wrapper of chromosome_runs."""
+    return chromosome_runs(*arguments)
+
+
+def build_coverage_cache(bam, directory, threads=1):
+    """
+    Coverage cache of indexed alignments in a directory;
+    the chromosomes are processed in parallel
+    """
+    os.makedirs(directory, exist_ok=True)
+    with pysam.AlignmentFile(bam, "rb") as alignments:
+        chromosomes = list(zip(alignments.references, alignments.lengths))
+
+    arguments = [(bam, chromosome) for chromosome, _ in chromosomes]
+    if threads > 1:
+        pool = Pool(processes=threads)
+        try:
+            all_runs = pool.map(_chromosome_runs, arguments, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        all_runs = [_chromosome_runs(a) for a in arguments]
+
+    index = {}
+    offsets = dict((strand, 0) for strand in STRANDS)
+    for (chromosome, length), runs in zip(chromosomes, all_runs):
+        index[chromosome] = {"length": length}
+        for strand, name in STRANDS.items():
+            count = len(runs[strand][0])
+            index[chromosome][name] = [offsets[strand], offsets[strand] + count]
+            offsets[strand] += count
+
+    for strand, name in STRANDS.items():
+        for column, (suffix, dtype) in enumerate(
+            (("starts", np.int64), ("values", np.uint32))
+        ):
+            arrays = [runs[strand][column] for runs in all_runs]
+            np.save(
+                os.path.join(directory, "{}_{}.npy".format(name, suffix)),
+                np.concatenate(arrays) if arrays else np.array([], dtype=dtype),
+            )
+    with open(os.path.join(directory, "index.json"), "w") as index_file:
+        json.dump(index, index_file)
+    return len(chromosomes), offsets["+"] + offsets["-"]
+
+
+class CoverageCache:
+    """
+    Read access to a coverage cache (0-based, half-open coordinates)
+    """
+
+    def __init__(self, directory):
+        with open(os.path.join(directory, "index.json")) as index_file:
+            self.index = json.load(index_file)
+        self.runs = {}
+        for strand, name in STRANDS.items():
+            self.runs[strand] = tuple(
+                np.load(
+                    os.path.join(directory, "{}_{}.npy".format(name, column)),
+                    mmap_mode="r",
+                )
+                for column in ("starts", "values")
+            )
+
+    def chromosomes(self):
+        """Names of the chromosomes."""
+        return list(self.index.keys())
+
+    def _strand_runs(self, chromosome, strand):
+        """Run starts and values of a chromosome on a strand."""
+        first, last = self.index[chromosome][STRANDS[strand]]
+        starts, values = self.runs[strand]
+        return starts[first:last], values[first:last]
+
+    def _strands(self, strand):
+        """Strands to sum over (both if none is given)."""
+        return list(STRANDS) if strand is None else [strand]
+
+    def coverage(self, chromosome, start, end, strand=None):
+        """Coverage of every position of a window."""
+        coverage = np.zeros(max(0, end - start), dtype=np.int64)
+        if chromosome not in self.index or end <= start:
+            return coverage
+        for current in self._strands(strand):
+            starts, values = self._strand_runs(chromosome, current)
+            if len(starts) == 0:
+                continue
+            first = max(0, np.searchsorted(starts, start, side="right") - 1)
+            last = np.searchsorted(starts, end, side="left")
+            bounds = np.append(
+                np.maximum(np.asarray(starts[first:last]), start), end
+            )
+            coverage += np.repeat(
+                np.asarray(values[first:last], dtype=np.int64), np.diff(bounds)
+            )
+        return coverage
+
+    def values_at(self, chromosome, positions, strand=None):
+        """Coverage at (0-based) positions."""
+        positions = np.asarray(positions, dtype=np.int64)
+        coverage = np.zeros(len(positions), dtype=np.int64)
+        if chromosome not in self.index:
+            return coverage
+        for current in self._strands(strand):
+            starts, values = self._strand_runs(chromosome, current)
+            if len(starts) == 0:
+                continue
+            runs = np.searchsorted(starts, positions, side="right") - 1
+            covered = runs >= 0
+            coverage[covered] += values[runs[covered]]
+        return coverage
+
+
+_open_caches = {}
+
+
+def open_coverage_cache(directory):
+    """Coverage cache of a directory, opened once per process."""
+    if directory not in _open_caches:
+        _open_caches[directory] = CoverageCache(directory)
+    return _open_caches[directory]
@@ -0,0 +1,382 @@
+"""
+##############################################################################
+#
+#   Demultiplexing of a batch of RNA-Seq samples aligned together by STAR.
+#
+#   Alignments are split into per-sample BAM files by their read group
+#   (RG tag = sample ID) in a single pass over the batch. STAR's mapping
+#   statistics are recomputed per sample from the alignments and the
+#   unmapped records (uT tag) and saved in the layout of Log.final.out.
+#   Unmapped records are not written to the per-sample files.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pysam
+
+# CIGAR operations
+BAM_CINS = 1
+BAM_CDEL = 2
+BAM_CREF_SKIP = 3
+
+# STAR's reasons of a read being unmapped (uT tag)
+UNMAPPED_OTHER = "0"
+UNMAPPED_TOO_SHORT = "1"
+UNMAPPED_TOO_MANY_MISMATCHES = "2"
+UNMAPPED_TOO_MANY_LOCI = "3"
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--samples",
+        dest="samples",
+        required=True,
+        nargs="+",
+        help="Sample IDs (read groups) of the batch.",
+    )
+    parser.add_argument(
+        "--genomic-bam",
+        dest="genomic_bam",
+        required=True,
+        help="Genome alignments of the batch (Aligned.out.bam).",
+    )
+    parser.add_argument(
+        "--transcriptomic-bam",
+        dest="transcriptomic_bam",
+        help="Transcriptome alignments of the batch "
+        "(Aligned.toTranscriptome.out.bam), if any.",
+    )
+    parser.add_argument(
+        "--star-log",
+        dest="star_log",
+        required=True,
+        help="STAR's Log.final.out of the batch.",
+    )
+    parser.add_argument(
+        "--outdir",
+        dest="outdir",
+        required=True,
+        help="Output directory for the per-sample files.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+class MappingStatistics:
+    """
+    STAR's mapping statistics of a sample accumulated over its records
+    (every read/read pair is counted once, on its primary record)
+    """
+
+    def __init__(self):
+        self.input_reads = 0
+        self.input_bases = 0
+        self.unique_reads = 0
+        self.multi_reads = 0
+        self.unmapped = {
+            UNMAPPED_OTHER: 0,
+            UNMAPPED_TOO_SHORT: 0,
+            UNMAPPED_TOO_MANY_MISMATCHES: 0,
+            UNMAPPED_TOO_MANY_LOCI: 0,
+        }
+        self.mapped_bases = 0
+        self.mismatches = 0
+        self.splices = {
+            "Total": 0,
+            "Annotated (sjdb)": 0,
+            "GT/AG": 0,
+            "GC/AG": 0,
+            "AT/AC": 0,
+            "Non-canonical": 0,
+        }
+        self.deletions = 0
+        self.deleted_bases = 0
+        self.insertions = 0
+        self.inserted_bases = 0
+
+    def add(self, read):
+        if read.is_secondary or read.is_supplementary:
+            return
+        if read.is_unmapped:
+            self.input_bases += read.query_length
+            # unmapped mates of mapped pairs (uT:4) are counted with the pair
+            if not read.is_paired or (read.is_read1 and read.mate_is_unmapped):
+                self.input_reads += 1
+                self.unmapped[str(read.get_tag("uT"))] += 1
+            return
+        self.input_bases += read.infer_read_length()
+        unique = read.get_tag("NH") == 1
+        if unique:
+            self.add_unique_alignment(read)
+        if not read.is_paired or read.is_read1 or read.mate_is_unmapped:
+            self.input_reads += 1
+            if unique:
+                self.unique_reads += 1
+                self.mismatches += read.get_tag("nM")
+            else:
+                self.multi_reads += 1
+
+    def add_unique_alignment(self, read):
+        self.mapped_bases += read.query_alignment_length
+        for operation, length in read.cigartuples:
+            if operation == BAM_CDEL:
+                self.deletions += 1
+                self.deleted_bases += length
+            elif operation == BAM_CINS:
+                self.insertions += 1
+                self.inserted_bases += length
+            elif operation == BAM_CREF_SKIP:
+                self.splices["Total"] += 1
+        # junction motifs: 0 non-canonical, 1/2 GT/AG, 3/4 GC/AG, 5/6 AT/AC;
+        # +20 if annotated (-1: no junctions); STAR writes the junctions of
+        # the whole pair to both mates, so they are counted once per pair
+        if read.has_tag("jM") and (
+            not read.is_paired or read.is_read1 or read.mate_is_unmapped
+        ):
+            for motif in read.get_tag("jM"):
+                if motif < 0:
+                    continue
+                if motif >= 20:
+                    self.splices["Annotated (sjdb)"] += 1
+                    motif -= 20
+                if motif == 0:
+                    self.splices["Non-canonical"] += 1
+                else:
+                    kind = ["GT/AG", "GC/AG", "AT/AC"][(motif - 1) // 2]
+                    self.splices[kind] += 1
+
+    def rows(self, timing):
+        """Rows of Log.final.out: (name, value); value None for headers."""
+
+        def percent(count, total):
+            return "{:.2f}%".format(100.0 * count / total if total else 0.0)
+
+        def ratio(count, total):
+            return "{:.2f}".format(float(count) / total if total else 0.0)
+
+        rows = list(timing)
+        rows += [
+            ("Number of input reads", self.input_reads),
+            (
+                "Average input read length",
+                int(round(float(self.input_bases) / self.input_reads))
+                if self.input_reads else 0,
+            ),
+            ("UNIQUE READS:", None),
+            ("Uniquely mapped reads number", self.unique_reads),
+            (
+                "Uniquely mapped reads %",
+                percent(self.unique_reads, self.input_reads),
+            ),
+            (
+                "Average mapped length",
+                ratio(self.mapped_bases, self.unique_reads),
+            ),
+        ]
+        rows += [
+            ("Number of splices: " + kind, count)
+            for kind, count in self.splices.items()
+        ]
+        rows += [
+            (
+                "Mismatch rate per base, %",
+                percent(self.mismatches, self.mapped_bases),
+            ),
+            (
+                "Deletion rate per base",
+                percent(self.deletions, self.mapped_bases),
+            ),
+            (
+                "Deletion average length",
+                ratio(self.deleted_bases, self.deletions),
+            ),
+            (
+                "Insertion rate per base",
+                percent(self.insertions, self.mapped_bases),
+            ),
+            (
+                "Insertion average length",
+                ratio(self.inserted_bases, self.insertions),
+            ),
+            ("MULTI-MAPPING READS:", None),
+            ("Number of reads mapped to multiple loci", self.multi_reads),
+            (
+                "% of reads mapped to multiple loci",
+                percent(self.multi_reads, self.input_reads),
+            ),
+        ]
+        for name, reason in [
+            ("mapped to too many loci", UNMAPPED_TOO_MANY_LOCI),
+            ("unmapped: too many mismatches", UNMAPPED_TOO_MANY_MISMATCHES),
+            ("unmapped: too short", UNMAPPED_TOO_SHORT),
+            ("unmapped: other", UNMAPPED_OTHER),
+        ]:
+            if reason == UNMAPPED_TOO_MANY_MISMATCHES:
+                rows.append(("UNMAPPED READS:", None))
+            rows += [
+                ("Number of reads " + name, self.unmapped[reason]),
+                (
+                    "% of reads " + name,
+                    percent(self.unmapped[reason], self.input_reads),
+                ),
+            ]
+        rows += [
+            ("CHIMERIC READS:", None),
+            ("Number of chimeric reads", 0),
+            ("% of chimeric reads", percent(0, self.input_reads)),
+        ]
+        return rows
+
+
+def read_timing(path):
+    """Timing rows of STAR's Log.final.out (shared by the whole batch)."""
+    timing = []
+    with open(path) as log:
+        for line in log:
+            if "|" not in line:
+                continue
+            name, value = [field.strip() for field in line.split("|", 1)]
+            timing.append((name, value))
+            if name.startswith("Mapping speed"):
+                break
+    return timing
+
+
+def write_star_log(path, rows):
+    with open(path, "w") as log:
+        for name, value in rows:
+            if value is None:
+                log.write("{:>48}\n".format(name))
+            else:
+                log.write("{:>48} |\t{}\n".format(name, value))
+            if name.startswith("Mapping speed"):
+                log.write("\n")
+
+
+def split_by_read_group(path, samples, suffix, statistics=None):
+    """
+    Write mapped records of every sample into <outdir>/<sample><suffix>
+    (header restricted to the sample's read group)
+    """
+    with pysam.AlignmentFile(path, "rb", check_sq=False) as batch:
+        header = batch.header.to_dict()
+        outputs = {}
+        for sample in samples:
+            sample_header = dict(header)
+            sample_header["RG"] = [
+                group for group in header.get("RG", []) if group["ID"] == sample
+            ]
+            outputs[sample] = pysam.AlignmentFile(
+                os.path.join(options.outdir, sample + suffix),
+                "wb",
+                header=sample_header,
+            )
+        for read in batch.fetch(until_eof=True):
+            sample = read.get_tag("RG")
+            if statistics is not None:
+                statistics[sample].add(read)
+            if not read.is_unmapped:
+                outputs[sample].write(read)
+        for output in outputs.values():
+            output.close()
+
+
+def main():
+    """Main body of the script."""
+
+    os.makedirs(options.outdir, exist_ok=True)
+
+    statistics = {sample: MappingStatistics() for sample in options.samples}
+    split_by_read_group(
+        options.genomic_bam, options.samples, ".Aligned.out.bam", statistics
+    )
+    if options.transcriptomic_bam is not None:
+        split_by_read_group(
+            options.transcriptomic_bam,
+            options.samples,
+            ".Aligned.toTranscriptome.out.bam",
+        )
+
+    timing = read_timing(options.star_log)
+    for sample in options.samples:
+        write_star_log(
+            os.path.join(options.outdir, sample + ".Log.final.out"),
+            statistics[sample].rows(timing),
+        )
+        logger.info(
+            "Sample {}: {} input reads, {} uniquely mapped".format(
+                sample,
+                statistics[sample].input_reads,
+                statistics[sample].unique_reads,
+            )
+        )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
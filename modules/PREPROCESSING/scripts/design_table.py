@@ -0,0 +1,155 @@
+"""
+##############################################################################
+#
+#   Cached index of the analysis design table.
+#
+#   The table is parsed once per workflow (re-parsed only if the file
+#   changes on disk); samples and fastq files are looked up in dictionaries
+#   by the input functions of the Snakefiles.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import re
+import hashlib
+import pandas as pd
+
+_cache = {}
+
+
+def natural_key(sample):
+    """Sort key of a sample ID with its numbers compared as numbers."""
+    return [
+        (0, int(part), "") if part.isdigit() else (1, 0, part)
+        for part in re.split(r"(\d+)", sample)
+    ]
+
+
+def alignment_batch_number(sample, batches):
+    """
+    Batch (1..batches) of a sample ID: stable hash, independent of the
+    other samples, of the process and of the Python version
+    """
+    digest = hashlib.md5(str(sample).encode("utf-8")).hexdigest()
+    return int(digest, 16) % batches + 1
+
+
+def fastq_name(path):
+    """Name of a fastq file: basename without the extensions."""
+    return path.split("/")[-1].split(".")[0]
+
+
+class DesignTable:
+    """
+    Per-sample rows of the design table with O(1) lookups
+    by sample ID and by fastq file name
+    """
+
+    def __init__(self, path):
+        table = pd.read_csv(
+            path, sep="\t", na_values=["nan"], keep_default_na=False
+        )
+        self.samples = [str(sample) for sample in table["sample"]]
+        self.rows = {}
+        self.fastq_paths = {}
+        for record in table.to_dict("records"):
+            sample = str(record["sample"])
+            self.rows[sample] = record
+            for column in ["fq1", "fq2"]:
+                if record[column] != "":
+                    self.fastq_paths.setdefault(
+                        fastq_name(record[column]), record[column]
+                    )
+        self.paired_end_samples = [
+            s for s in self.samples if self.is_paired_end(s)
+        ]
+        self.single_end_samples = [
+            s for s in self.samples if self.is_single_end(s)
+        ]
+        self._alignment_batches = {}
+
+    def row(self, sample):
+        """All columns of the design table for a sample."""
+        return self.rows[str(sample)]
+
+    def is_paired_end(self, sample):
+        row = self.row(sample)
+        return row["fq1"] != "" and row["fq2"] != ""
+
+    def is_single_end(self, sample):
+        row = self.row(sample)
+        return (row["fq1"] == "") ^ (row["fq2"] == "")
+
+    def fastq_files(self, sample):
+        """Paths to the fastq files of a sample (fq1, fq2; non-empty)."""
+        row = self.row(sample)
+        return [row[c] for c in ["fq1", "fq2"] if row[c] != ""]
+
+    def fastq_names(self):
+        """Names of all fastq files, in the order of the design table."""
+        return [
+            fastq_name(row[column])
+            for column in ["fq1", "fq2"]
+            for row in self.rows.values()
+            if row[column] != ""
+        ]
+
+    def fastq_path(self, name):
+        """Full path to a fastq file given its name."""
+        return self.fastq_paths[name]
+
+    def alignment_batches(self, batches):
+        """
+        Samples grouped into a fixed number of batches aligned together;
+        paired-end and single-end samples are never mixed in a batch.
+        A sample goes to the batch given by the hash of its ID alone, so
+        adding a sample to the design table changes the members (and
+        outputs) of its own batch only; empty batches are left out and
+        the members of a batch are sorted (numbers compared as numbers)
+        """
+        batches = max(1, int(batches))
+        if batches not in self._alignment_batches:
+            groups = {}
+            for layout, samples in [
+                ("pe", self.paired_end_samples),
+                ("se", self.single_end_samples),
+            ]:
+                for sample in samples:
+                    batch = "batch_{}_{}".format(
+                        layout, alignment_batch_number(sample, batches)
+                    )
+                    groups.setdefault(batch, []).append(sample)
+            groups = {
+                batch: sorted(group, key=natural_key)
+                for batch, group in sorted(groups.items())
+            }
+            self._alignment_batches[batches] = (
+                groups,
+                {s: batch for batch, group in groups.items() for s in group},
+            )
+        return self._alignment_batches[batches][0]
+
+    def alignment_batch(self, sample, batches):
+        """Batch of a sample (see alignment_batches)."""
+        self.alignment_batches(batches)
+        return self._alignment_batches[max(1, int(batches))][1][str(sample)]
+
+
+def load_design_table(path):
+    """
+    Indexed design table; parsed on the first call and whenever
+    the file is modified, served from memory otherwise
+    """
+    path = os.path.abspath(path)
+    stat = os.stat(path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    cached = _cache.get(path)
+    if cached is None or cached[0] != stamp:
+        cached = (stamp, DesignTable(path))
+        _cache[path] = cached
+    return cached[1]
@@ -0,0 +1,108 @@
+"""
+##############################################################################
+#
+#   Admission of the samples of a run against a disk budget.
+#
+#   The footprint of a sample is the size of its outputs kept in the
+#   output directory of the preprocessing, measured on disk; a sample
+#   whose alignments are not finished yet is projected to keep at least
+#   the size of its fastq files times a factor. Samples with alignments
+#   on disk are always admitted (their files take the space anyway); new
+#   samples are admitted in the order of the design table while the
+#   total footprint fits into the budget, the others are held back.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+
+# per-sample outputs kept in the output directory: files named after the
+# sample and directories of the sample
+KEPT_FILE_DIRECTORIES = ["fastp_trimmed", "tail_trimmed"]
+KEPT_DIRECTORIES = [
+    "alignments", "splice_junctions", "coverage_cache", "RNASeQC", "TIN"
+]
+FINISHED = "{sample}.Aligned.out.sorted.bam.bai"
+
+
+def size_mb(path):
+    """Size (MB) of a file or of all files under a directory."""
+    if os.path.isfile(path):
+        return os.path.getsize(path) / 1e6
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(directory, name)
+            if os.path.isfile(file_path):
+                total += os.path.getsize(file_path)
+    return total / 1e6
+
+
+def kept_footprint_mb(outdir, sample):
+    """Size (MB) of the outputs of a sample kept in the output directory."""
+    total = 0
+    for directory in KEPT_FILE_DIRECTORIES:
+        directory = os.path.join(outdir, directory)
+        if os.path.isdir(directory):
+            total += sum(
+                size_mb(os.path.join(directory, name))
+                for name in os.listdir(directory)
+                if name.startswith(sample + ".")
+            )
+    for directory in KEPT_DIRECTORIES:
+        path = os.path.join(outdir, directory, sample)
+        if os.path.exists(path):
+            total += size_mb(path)
+    return total
+
+
+def sample_footprints_mb(design_table, outdir, factor):
+    """
+    Footprint (MB) of every sample and whether it has alignments on disk:
+    dictionary sample -> (footprint, started)
+    """
+    footprints = {}
+    for sample in design_table.samples:
+        kept = kept_footprint_mb(outdir, sample)
+        alignments = os.path.join(outdir, "alignments", sample)
+        if os.path.isfile(os.path.join(alignments, FINISHED.format(
+            sample=sample
+        ))):
+            footprints[sample] = (kept, True)
+            continue
+        projected = factor * sum(
+            size_mb(path) for path in design_table.fastq_files(sample)
+            if os.path.isfile(path)
+        )
+        # trimmed reads and 1st-pass junctions of all samples may exist
+        # (cohort junctions): a sample is started by its alignments only
+        started = os.path.isdir(alignments) and size_mb(alignments) > 0
+        footprints[sample] = (max(kept, projected), started)
+    return footprints
+
+
+def admit_samples(samples, footprints, budget_mb):
+    """
+    Samples admitted into the budget (MB) and held back (both in the given
+    order): samples with alignments on disk first, then new samples while
+    they fit; a single new sample is admitted if nothing else runs
+    """
+    total = sum(footprints[s][0] for s in samples if footprints[s][1])
+    admitted = set(s for s in samples if footprints[s][1])
+    for sample in samples:
+        if sample in admitted:
+            continue
+        if total + footprints[sample][0] <= budget_mb or not admitted:
+            admitted.add(sample)
+            total += footprints[sample][0]
+        else:
+            # keep the order of the design table: later samples wait too
+            break
+    return (
+        [s for s in samples if s in admitted],
+        [s for s in samples if s not in admitted],
+    )
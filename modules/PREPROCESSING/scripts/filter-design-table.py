@@ -20,6 +20,7 @@ import logging.handlers
 from argparse import ArgumentParser, RawTextHelpFormatter
 import numpy as np
 import pandas as pd
+from qc_checks import passes_TIN, passes_RNASeQC, passes_STAR
 
 
 def parse_arguments():
@@ -122,7 +123,7 @@ def main():
     TIN.index.rename("sample", inplace=True)
     TIN.columns = ["median_TIN_score"]
     for sample_ID in TIN.index.values:
-        if float(TIN.at[sample_ID, "median_TIN_score"]) < float(options.TIN_cutoff):
+        if not passes_TIN(TIN.at[sample_ID, "median_TIN_score"], options.TIN_cutoff):
             samples_to_remove.append(sample_ID)
 
     # quality filtering based on the mapping scores (RNA-SeQC)
@@ -130,13 +131,11 @@ def main():
 
     # RNA-SeQC quality filtering
     for sample_ID in rnaseqc_table.columns.values:
-        if (
-            rnaseqc_table[sample_ID]["High Quality Rate"]
-            < float(options.rnaseqc_min_high_quality_rate)
-            or rnaseqc_table[sample_ID]["Intergenic Rate"]
-            > float(options.rnaseqc_max_intergenic_rate)
-            or rnaseqc_table[sample_ID]["rRNA Rate"]
-            > float(options.rnaseqc_max_rRNA_rate)
+        if not passes_RNASeQC(
+            rnaseqc_table[sample_ID],
+            options.rnaseqc_min_high_quality_rate,
+            options.rnaseqc_max_intergenic_rate,
+            options.rnaseqc_max_rRNA_rate,
         ):
             samples_to_remove.append(sample_ID)
 
@@ -145,11 +144,10 @@ def main():
 
     # STAR quality filtering
     for sample_ID_star in star_table.columns.values:
-        if (
-            float(star_table[sample_ID_star]["Mapping Rate"])
-            < float(options.rnaseqc_min_mapping_rate)
-            or float(star_table[sample_ID_star]["Unique Rate of Mapped"])
-            < float(options.rnaseqc_min_unique_rate_of_mapped)
+        if not passes_STAR(
+            star_table[sample_ID_star],
+            options.rnaseqc_min_mapping_rate,
+            options.rnaseqc_min_unique_rate_of_mapped,
         ):
             samples_to_remove.append(sample_ID_star)
 
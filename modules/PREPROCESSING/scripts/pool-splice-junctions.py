@@ -0,0 +1,175 @@
+"""
+##############################################################################
+#
+#   Pooling of the splice junctions discovered by STAR (1st pass)
+#   over all samples of a cohort.
+#
+#   Novel, canonical junctions are kept if they are supported by enough
+#   uniquely mapped reads (summed over the cohort) and by enough samples
+#   (batches of samples if the 1st pass ran per batch: STAR reports the
+#   junctions of a batch together).
+#   The output is in the format of STAR's --sjdbFileChrStartEnd.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+
+# columns of STAR's SJ.out.tab
+SJ_COLUMNS = [
+    "chromosome",
+    "start",
+    "end",
+    "strand",
+    "motif",
+    "annotated",
+    "unique_reads",
+    "multimapping_reads",
+    "max_overhang",
+]
+
+# strand encoding of SJ.out.tab and of --sjdbFileChrStartEnd
+STRANDS = {0: ".", 1: "+", 2: "-"}
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--splice-junctions",
+        dest="splice_junctions",
+        required=True,
+        nargs="+",
+        help="Per-sample (or per-batch) SJ.out.tab files of STAR.",
+    )
+    parser.add_argument(
+        "--min-unique-reads",
+        dest="min_unique_reads",
+        type=int,
+        default=1,
+        help="Minimal number of uniquely mapped reads (over all samples).",
+    )
+    parser.add_argument(
+        "--min-samples",
+        dest="min_samples",
+        type=int,
+        default=1,
+        help="Minimal number of samples (or batches) with uniquely mapped reads.",
+    )
+    parser.add_argument(
+        "--output",
+        dest="output",
+        required=True,
+        help="Pooled splice junctions (chromosome, start, end, strand).",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def read_novel_junctions(path):
+    """Novel canonical junctions of a sample with uniquely mapped reads."""
+    junctions = pd.read_csv(
+        path, sep="\t", header=None, names=SJ_COLUMNS, dtype={"chromosome": str}
+    )
+    junctions = junctions.loc[
+        (junctions["annotated"] == 0)
+        & (junctions["motif"] > 0)
+        & (junctions["unique_reads"] > 0),
+        ["chromosome", "start", "end", "strand", "unique_reads"],
+    ]
+    return junctions
+
+
+def main():
+    """Main body of the script."""
+
+    junctions = pd.concat(
+        [read_novel_junctions(path) for path in options.splice_junctions]
+    )
+    junctions["samples"] = 1
+    pooled = junctions.groupby(
+        ["chromosome", "start", "end", "strand"], as_index=False
+    )[["unique_reads", "samples"]].sum()
+    pooled = pooled.loc[
+        (pooled["unique_reads"] >= options.min_unique_reads)
+        & (pooled["samples"] >= options.min_samples)
+    ]
+    pooled["strand"] = pooled["strand"].map(STRANDS)
+    pooled = pooled.sort_values(["chromosome", "start", "end"])
+    pooled[["chromosome", "start", "end", "strand"]].to_csv(
+        options.output, sep="\t", header=False, index=False
+    )
+    logger.info(
+        "{} novel junctions in {} samples, {} pooled".format(
+            len(junctions.drop_duplicates(["chromosome", "start", "end"])),
+            len(options.splice_junctions),
+            len(pooled),
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
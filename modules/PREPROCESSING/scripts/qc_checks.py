@@ -0,0 +1,127 @@
+"""
+##############################################################################
+#
+#   Quality control thresholds of RNA-Seq samples
+#   (shared by the cohort-level and the per-sample filtering).
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import pandas as pd
+
+PASS = "PASS"
+FAIL = "FAIL"
+NOT_EVALUATED = "not evaluated"
+
+# checks of the per-sample quality control, ordered from the cheapest
+# to the most expensive signal (a sample which failed a check is not
+# evaluated by the following ones)
+QC_CASCADE = ["STAR", "idxstats", "RNA-SeQC", "TIN"]
+
+
+def passes_TIN(median_TIN_score, min_median_TIN_score):
+    """Quality filtering based on the median TIN score."""
+    return not float(median_TIN_score) < float(min_median_TIN_score)
+
+
+def passes_RNASeQC(
+    metrics, min_high_quality_rate, max_intergenic_rate, max_rRNA_rate
+):
+    """Quality filtering based on the mapping scores (RNA-SeQC)."""
+    return not (
+        float(metrics["High Quality Rate"]) < float(min_high_quality_rate)
+        or float(metrics["Intergenic Rate"]) > float(max_intergenic_rate)
+        or float(metrics["rRNA Rate"]) > float(max_rRNA_rate)
+    )
+
+
+def passes_STAR(metrics, min_mapping_rate, min_unique_rate_of_mapped):
+    """
+    Quality filtering based on the mapping scores (STAR);
+    a sample without any mapped reads always fails
+    """
+    return not (
+        float(metrics["Mapping Rate"]) == 0
+        or float(metrics["Mapping Rate"]) < float(min_mapping_rate)
+        or float(metrics["Unique Rate of Mapped"])
+        < float(min_unique_rate_of_mapped)
+    )
+
+
+def passes_idxstats(mapped_reads, min_mapped_reads):
+    """Quality filtering based on the number of mapped reads (samtools)."""
+    return not int(mapped_reads) < int(min_mapped_reads)
+
+
+def STAR_mapping_rates(star_log):
+    """
+    Mapping Rate and Unique Rate of Mapped from STAR's Log.final.out
+    (pd.Series indexed by the report rows, as in tables_star.py);
+    the Unique Rate of Mapped is 0 if no reads were mapped
+    """
+    unique = float(str(star_log["Uniquely mapped reads %"]).rstrip("%"))
+    multi = float(str(star_log["% of reads mapped to multiple loci"]).rstrip("%"))
+    too_many = float(
+        str(star_log["% of reads mapped to too many loci"]).rstrip("%")
+    )
+    mapping_rate = (unique + multi + too_many) / 100
+    return {
+        "Mapping Rate": mapping_rate,
+        "Unique Rate of Mapped": (
+            (unique / 100) / mapping_rate if mapping_rate > 0 else 0.0
+        ),
+    }
+
+
+def idxstats_mapped_reads(path):
+    """Number of mapped reads from the output of samtools idxstats."""
+    idxstats = pd.read_csv(
+        path,
+        sep="\t",
+        header=None,
+        names=["sequence", "length", "mapped", "unmapped"],
+    )
+    return int(idxstats["mapped"].sum())
+
+
+def median_TIN(values):
+    """Median TIN score of a sample (as in PQA_calculate_median_TIN_score)."""
+    sortedTIN = sorted(values)
+    index = (len(sortedTIN) - 1) // 2
+    if len(sortedTIN) % 2:
+        return sortedTIN[index]
+    return (sortedTIN[index] + sortedTIN[index + 1]) / 2
+
+
+def write_verdict(path, sample, checks):
+    """
+    Save per-sample QC verdict:
+    checks: list of (check, value, status) tuples; the sample passes
+    if none of the checks failed
+    """
+    statuses = [status for _, _, status in checks]
+    verdict = FAIL if FAIL in statuses else PASS
+    rows = [[sample, check, value, status] for check, value, status in checks]
+    rows.append([sample, "verdict", "", verdict])
+    pd.DataFrame(rows, columns=["sample", "check", "value", "status"]).to_csv(
+        path, sep="\t", index=False
+    )
+    return verdict
+
+
+def read_checks(path):
+    """Per-check (check, value, status) tuples of a saved verdict."""
+    table = pd.read_csv(path, sep="\t", keep_default_na=False)
+    table = table.loc[table["check"] != "verdict"]
+    return list(zip(table["check"], table["value"], table["status"]))
+
+
+def read_verdict(path):
+    """Sample ID and its overall QC verdict (PASS/FAIL)."""
+    table = pd.read_csv(path, sep="\t", keep_default_na=False)
+    verdict = table.loc[table["check"] == "verdict"]
+    return verdict["sample"].values[0], verdict["status"].values[0]
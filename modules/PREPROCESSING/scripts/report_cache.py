@@ -0,0 +1,125 @@
+"""
+##############################################################################
+#
+#   Incremental aggregation of per-sample reports.
+#
+#   Parsed reports are kept in an SQLite database, keyed by the path of the
+#   report and its fingerprint (modification time and size). On every run
+#   only new or changed reports are parsed (in a thread pool); the remaining
+#   ones are loaded from the cache. Every report type has a database of
+#   its own, written by a single job: SQLite locking is not reliable on
+#   shared (network) file systems.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import json
+import sqlite3
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+
+def fingerprint(path):
+    """Modification time (ns) and size of a file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+class ReportCache:
+    """
+    Cache of parsed per-sample reports (one column each)
+    """
+
+    def __init__(self, db_path, kind):
+        self.kind = kind
+        if db_path != ":memory:":
+            db_dir = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, timeout=600)
+        self.connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS reports (
+                kind TEXT NOT NULL,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                name TEXT NOT NULL,
+                dtype TEXT NOT NULL,
+                index_name TEXT,
+                labels TEXT NOT NULL,
+                vals TEXT NOT NULL,
+                PRIMARY KEY (kind, path)
+            )
+            """
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def _load(self, path, stamp):
+        row = self.connection.execute(
+            "SELECT mtime_ns, size, name, dtype, index_name, labels, vals "
+            "FROM reports "
+            "WHERE kind = ? AND path = ?",
+            (self.kind, path),
+        ).fetchone()
+        if row is None or (row[0], row[1]) != stamp:
+            return None
+        index = pd.Index(json.loads(row[5]), name=row[4])
+        return pd.Series(
+            json.loads(row[6]), index=index, name=row[2]
+        ).astype(row[3])
+
+    def _store(self, path, stamp, series):
+        self.connection.execute(
+            "INSERT OR REPLACE INTO reports VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                self.kind,
+                path,
+                stamp[0],
+                stamp[1],
+                str(series.name),
+                str(series.dtype),
+                series.index.name,
+                json.dumps(series.index.tolist()),
+                json.dumps(series.tolist()),
+            ),
+        )
+
+    def collect(self, reports, parser, threads=1):
+        """
+        Return parsed reports (list of pd.Series, in the input order)
+        reports: list of (name, path) tuples
+        parser: function(path, name) -> pd.Series (named after the column)
+        Reports absent from the cache or changed on disk are re-parsed.
+        """
+        results = [None] * len(reports)
+        stale = []
+        for i, (name, path) in enumerate(reports):
+            path = os.path.abspath(path)
+            stamp = fingerprint(path)
+            series = self._load(path, stamp)
+            if series is not None:
+                results[i] = series
+            else:
+                stale.append((i, name, path, stamp))
+
+        if stale:
+            with ThreadPoolExecutor(max_workers=max(1, threads)) as executor:
+                parsed = list(executor.map(
+                    lambda entry: parser(entry[2], entry[1]), stale
+                ))
+            for (i, name, path, stamp), series in zip(stale, parsed):
+                self._store(path, stamp, series)
+                results[i] = series
+            self.connection.commit()
+
+        self.n_parsed = len(stale)
+        self.n_cached = len(reports) - len(stale)
+        return results
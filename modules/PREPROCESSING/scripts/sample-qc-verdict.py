@@ -0,0 +1,250 @@
+"""
+##############################################################################
+#
+#   Quality control verdict of a single RNA-Seq sample
+#   (thresholds of filter-design-table.py applied per sample).
+#
+#   The checks are evaluated as a cascade of gates: every gate extends the
+#   verdict of the preceding one with the reports provided to it; checks
+#   without a report are recorded as "not evaluated".
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+from qc_checks import (
+    passes_TIN,
+    passes_RNASeQC,
+    passes_STAR,
+    passes_idxstats,
+    STAR_mapping_rates,
+    idxstats_mapped_reads,
+    median_TIN,
+    read_checks,
+    write_verdict,
+    QC_CASCADE,
+    PASS,
+    FAIL,
+    NOT_EVALUATED,
+)
+from tables_star import read_star_log
+from tables_rnaseqc import read_rnaseqc_metrics
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--sample",
+        dest="sample",
+        required=True,
+        help="Sample ID.",
+    )
+    parser.add_argument(
+        "--previous-gate",
+        dest="previous_gate",
+        help="Verdict of the preceding QC gate in a TSV format.",
+    )
+    parser.add_argument(
+        "--star-log",
+        dest="star_log",
+        help="STAR's Log.final.out of the sample.",
+    )
+    parser.add_argument(
+        "--idxstats",
+        dest="idxstats",
+        help="Output of samtools idxstats for the sample.",
+    )
+    parser.add_argument(
+        "--rnaseqc-metrics",
+        dest="rnaseqc_metrics",
+        help="RNA-SeQC metrics of the sample in a TSV format.",
+    )
+    parser.add_argument(
+        "--TIN-scores",
+        dest="TIN",
+        help="Per-transcript TIN scores of the sample in a TSV format.",
+    )
+    parser.add_argument(
+        "--verdict-out",
+        dest="output",
+        required=True,
+        help="Per-sample QC verdict in a TSV format.",
+    )
+    parser.add_argument(
+        "--min-median-TIN-cutoff",
+        dest="TIN_cutoff",
+        required=True,
+        help="Minimal value for the median TIN score per sample.",
+    )
+    parser.add_argument(
+        "--min-mapped-reads",
+        dest="min_mapped_reads",
+        required=True,
+        help="samtools idxstats: minimal number of mapped reads.",
+    )
+    parser.add_argument(
+        "--min-mapping-rate",
+        dest="rnaseqc_min_mapping_rate",
+        required=True,
+        help="RNA-SeQC: minimal value for the Mapping Rate.",
+    )
+    parser.add_argument(
+        "--min-unique-rate-of-mapped",
+        dest="rnaseqc_min_unique_rate_of_mapped",
+        required=True,
+        help="RNA-SeQC: minimal value for the Unique Rate of Mapped.",
+    )
+    parser.add_argument(
+        "--min-high-quality-rate",
+        dest="rnaseqc_min_high_quality_rate",
+        required=True,
+        help="RNA-SeQC: minimal value for the High Quality Rate.",
+    )
+    parser.add_argument(
+        "--max-intergenic-rate",
+        dest="rnaseqc_max_intergenic_rate",
+        required=True,
+        help="RNA-SeQC: maximal value for the Intergenic Rate.",
+    )
+    parser.add_argument(
+        "--max-rRNA-rate",
+        dest="rnaseqc_max_rRNA_rate",
+        required=True,
+        help="RNA-SeQC: maximal value for the rRNA Rate.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def status(passed):
+    return PASS if passed else FAIL
+
+
+def main():
+    """Main body of the script."""
+
+    # checks evaluated by the preceding gates
+    checks = {check: ("", NOT_EVALUATED) for check in QC_CASCADE}
+    if options.previous_gate is not None:
+        for check, value, check_status in read_checks(options.previous_gate):
+            checks[check] = (value, check_status)
+    # a sample which failed a preceding gate is not evaluated any further
+    failed = FAIL in [check_status for _, check_status in checks.values()]
+
+    # quality filtering based on the mapping scores (STAR)
+    if not failed and options.star_log is not None:
+        star_metrics = STAR_mapping_rates(
+            read_star_log(options.star_log, options.sample)
+        )
+        checks["STAR"] = (
+            star_metrics["Mapping Rate"],
+            status(passes_STAR(
+                star_metrics,
+                options.rnaseqc_min_mapping_rate,
+                options.rnaseqc_min_unique_rate_of_mapped,
+            )),
+        )
+
+    # quality filtering based on the number of mapped reads (samtools)
+    if not failed and options.idxstats is not None:
+        mapped_reads = idxstats_mapped_reads(options.idxstats)
+        checks["idxstats"] = (
+            mapped_reads,
+            status(passes_idxstats(mapped_reads, options.min_mapped_reads)),
+        )
+
+    # quality filtering based on the mapping scores (RNA-SeQC)
+    if not failed and options.rnaseqc_metrics is not None:
+        rnaseqc_metrics = read_rnaseqc_metrics(
+            options.rnaseqc_metrics, options.sample
+        )
+        checks["RNA-SeQC"] = (
+            rnaseqc_metrics["High Quality Rate"],
+            status(passes_RNASeQC(
+                rnaseqc_metrics,
+                options.rnaseqc_min_high_quality_rate,
+                options.rnaseqc_max_intergenic_rate,
+                options.rnaseqc_max_rRNA_rate,
+            )),
+        )
+
+    # quality filtering based on TIN score calculation
+    if not failed and options.TIN is not None:
+        TIN = pd.read_csv(options.TIN, sep="\t", index_col=0).iloc[:, 0]
+        median = median_TIN(TIN)
+        checks["TIN"] = (median, status(passes_TIN(median, options.TIN_cutoff)))
+
+    verdict = write_verdict(
+        options.output,
+        options.sample,
+        [(check,) + checks[check] for check in QC_CASCADE],
+    )
+    logger.info("Sample {}: {}".format(options.sample, verdict))
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
@@ -0,0 +1,254 @@
+"""
+##############################################################################
+#
+#   Reduce a genomic annotation (GTF) to the selected chromosomes and
+#   transcript biotypes, strip the attributes unused by the workflow
+#   and index the result per chromosome.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import gzip
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+# attributes required by STAR, RNA-SeQC (collapsed GTF), TECtool and
+# the python scripts of the workflow
+DEFAULT_ATTRIBUTES = [
+    "gene_id",
+    "gene_version",
+    "gene_name",
+    "gene_biotype",
+    "gene_type",
+    "transcript_id",
+    "transcript_version",
+    "transcript_name",
+    "transcript_biotype",
+    "transcript_type",
+    "exon_id",
+    "exon_version",
+    "exon_number",
+    "tag",
+]
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--gtf-in",
+        dest="gtf_in",
+        required=True,
+        help="Genomic annotation in GTF format (optionally gzipped).",
+    )
+    parser.add_argument(
+        "--gtf-out",
+        dest="gtf_out",
+        required=True,
+        help="Reduced genomic annotation in GTF format.",
+    )
+    parser.add_argument(
+        "--index-out",
+        dest="index_out",
+        required=True,
+        help="Per-chromosome byte offsets of the reduced GTF in a TSV format.",
+    )
+    parser.add_argument(
+        "--chromosomes",
+        dest="chromosomes",
+        nargs="*",
+        default=[],
+        help="Chromosomes to keep (all if not provided).",
+    )
+    parser.add_argument(
+        "--transcript-biotypes",
+        dest="biotypes",
+        nargs="*",
+        default=[],
+        help="Transcript biotypes to keep (all if not provided).",
+    )
+    parser.add_argument(
+        "--attributes",
+        dest="attributes",
+        nargs="+",
+        default=DEFAULT_ATTRIBUTES,
+        help="Attributes to keep in the 9th column.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def get_attribute(attributes_string, key):
+    """Value of an attribute from the 9th GTF column (None if absent)."""
+    position = attributes_string.find(key + " ")
+    while position > 0 and attributes_string[position - 1] not in " ;":
+        position = attributes_string.find(key + " ", position + 1)
+    if position == -1:
+        return None
+    value = attributes_string[position + len(key) + 1:].split(";", 1)[0]
+    return value.strip().strip('"')
+
+
+def strip_attributes(attributes_string, keep):
+    """Remove all the attributes not listed in 'keep' (order is preserved)."""
+    fields = [f.strip() for f in attributes_string.split(";")]
+    fields = [f for f in fields if f and f.split(" ", 1)[0] in keep]
+    return "; ".join(fields) + ";"
+
+
+def gene_blocks(gtf):
+    """
+    Iterate over the GTF: yield header lines (as strings)
+    and lists of split records grouped per consecutive gene_id
+    """
+    opener = gzip.open(gtf, "rt") if gtf.endswith(".gz") else open(gtf, "r")
+    block, block_gene = [], None
+    with opener as f:
+        for line in f:
+            if line.startswith("#"):
+                if line.startswith(("##", "#!")):
+                    yield line.rstrip("\n")
+                continue
+            row = line.rstrip("\n").split("\t")
+            if len(row) < 9:
+                continue
+            gene_id = get_attribute(row[8], "gene_id")
+            if gene_id != block_gene and block:
+                yield block
+                block = []
+            block_gene = gene_id
+            block.append(row)
+    if block:
+        yield block
+
+
+def select_records(block, biotypes):
+    """
+    Select records of transcripts with a requested biotype;
+    the gene record is kept only if any of its transcripts is kept
+    """
+    if not biotypes:
+        return block
+    kept = []
+    gene_records = []
+    for row in block:
+        if row[2] == "gene":
+            gene_records.append(row)
+            continue
+        biotype = get_attribute(row[8], "transcript_biotype")
+        if biotype is None:
+            biotype = get_attribute(row[8], "transcript_type")
+        if biotype in biotypes:
+            kept.append(row)
+    if not kept:
+        return []
+    return gene_records + kept
+
+
+def main():
+    """Main body of the script."""
+
+    chromosomes = set(options.chromosomes)
+    biotypes = set(options.biotypes)
+    keep = set(options.attributes)
+
+    # index: contiguous blocks of records per chromosome
+    index = []
+    n_genes = 0
+    with open(options.gtf_out, "wb") as gtf_out:
+        for block in gene_blocks(options.gtf_in):
+            if isinstance(block, str):
+                gtf_out.write((block + "\n").encode("utf-8"))
+                continue
+            chrom = block[0][0]
+            if chromosomes and chrom not in chromosomes:
+                continue
+            records = select_records(block, biotypes)
+            if not records:
+                continue
+            n_genes += 1
+            offset = gtf_out.tell()
+            for row in records:
+                row[8] = strip_attributes(row[8], keep)
+                gtf_out.write(("\t".join(row) + "\n").encode("utf-8"))
+            if index and index[-1][0] == chrom:
+                index[-1][2] += gtf_out.tell() - offset
+                index[-1][3] += len(records)
+            else:
+                index.append([chrom, offset, gtf_out.tell() - offset, len(records)])
+
+    with open(options.index_out, "w") as index_out:
+        index_out.write("chrom\toffset\tlength\tlines\n")
+        for entry in index:
+            index_out.write("\t".join([str(e) for e in entry]) + "\n")
+
+    logger.info(
+        "Kept {} genes on {} chromosomes".format(
+            n_genes, len(set([e[0] for e in index]))
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
@@ -0,0 +1,94 @@
+#!/bin/bash
+# -----------------------------------------------------------------------------
+# Run a read trimmer (cutadapt) writing uncompressed fastq files and compress
+# them on the fly with a parallel compressor: every output file (-o, -p)
+# with the .gz extension is replaced by a named pipe in a local temporary
+# directory ($TMPDIR), read by the compressor which writes the actual file.
+# The script returns once all the outputs are compressed.
+# -----------------------------------------------------------------------------
+usage()
+{
+cat << EOF
+usage: $0 options -- cutadapt [cutadapt options] -o OUT.gz [-p OUT.gz] INPUT
+OPTIONS:
+   -t                  The number of compression threads per file.
+EOF
+}
+
+if [ $# -lt 1 ] ; then
+    usage
+    exit 1
+fi
+
+# _____________________________________________________________________________
+# -----------------------------------------------------------------------------
+# Declare input variables (DEBUG MODE)
+# -----------------------------------------------------------------------------
+threads=""
+
+unset threads
+
+# -----------------------------------------------------------------------------
+# Declare input variables (OPERATIVE MODE)
+# -----------------------------------------------------------------------------
+while getopts t: opt
+do
+   case "$opt" in
+      t) threads=$OPTARG;;
+   esac
+done
+shift $((OPTIND - 1))
+
+# _____________________________________________________________________________
+# -----------------------------------------------------------------------------
+# check if we got an argument
+if [ "$threads" == "" ] || [ $# -lt 1 ] ; then
+    usage
+    exit -1
+fi
+
+# parallel compression if pigz is available
+if command -v pigz > /dev/null 2>&1 ; then
+    compress="pigz -c -p ${threads}"
+else
+    compress="gzip -c"
+fi
+
+fifo_dir=$(mktemp -d)
+trap 'rm -rf "${fifo_dir}"' EXIT
+
+# -----------------------------------------------------------------------------
+# Replace the compressed outputs by named pipes read by the compressor
+# -----------------------------------------------------------------------------
+command=()
+compressors=()
+output=false
+for argument in "$@"
+do
+    if [ "$output" = true ] && [[ $argument == *.gz ]] ; then
+        fifo="${fifo_dir}/${#compressors[@]}.$(basename "${argument%.gz}")"
+        mkfifo "$fifo"
+        $compress < "$fifo" > "$argument" &
+        compressors+=($!)
+        argument="$fifo"
+    fi
+    output=false
+    if [ "$argument" == "-o" ] || [ "$argument" == "-p" ] ; then
+        output=true
+    fi
+    command+=("$argument")
+done
+
+"${command[@]}"
+status=$?
+if [ $status -ne 0 ] ; then
+    # compressors of the outputs which were never opened
+    kill "${compressors[@]}" 2> /dev/null
+fi
+
+# the outputs are complete once the compressors are finished
+for compressor in "${compressors[@]}"
+do
+    wait "$compressor" || [ $status -ne 0 ] || status=1
+done
+exit $status
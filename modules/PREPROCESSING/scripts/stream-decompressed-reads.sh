@@ -0,0 +1,120 @@
+#!/bin/bash
+# -----------------------------------------------------------------------------
+# Run STAR on gzipped fastq files decompressed on the fly:
+# every file given to --readFilesIn is replaced by a named pipe in a local
+# temporary directory ($TMPDIR), fed by a (parallel) decompressor.
+# No uncompressed fastq file is written to disk and STAR does not spawn the
+# decompression itself (--readFilesCommand), so its temporary directory
+# (next to the outputs) does not need to support named pipes.
+# STAR's 2-pass mapping re-opens the inputs: the pipes are fed once per open.
+# -----------------------------------------------------------------------------
+usage()
+{
+cat << EOF
+usage: $0 options -- STAR [STAR options] --readFilesIn FILES.gz [...]
+OPTIONS:
+   -p                  The number of decompression threads per file.
+EOF
+}
+
+if [ $# -lt 1 ] ; then
+    usage
+    exit 1
+fi
+
+# _____________________________________________________________________________
+# -----------------------------------------------------------------------------
+# Declare input variables (DEBUG MODE)
+# -----------------------------------------------------------------------------
+threads=""
+
+unset threads
+
+# -----------------------------------------------------------------------------
+# Declare input variables (OPERATIVE MODE)
+# -----------------------------------------------------------------------------
+while getopts p: opt
+do
+   case "$opt" in
+      p) threads=$OPTARG;;
+   esac
+done
+shift $((OPTIND - 1))
+
+# _____________________________________________________________________________
+# -----------------------------------------------------------------------------
+# check if we got an argument
+if [ "$threads" == "" ] || [ $# -lt 1 ] ; then
+    usage
+    exit -1
+fi
+
+# parallel decompression if pigz is available
+if command -v pigz > /dev/null 2>&1 ; then
+    decompress="pigz -dc -p ${threads}"
+else
+    decompress="gzip -dc"
+fi
+
+fifo_dir=$(mktemp -d)
+writers=()
+cleanup()
+{
+    kill "${writers[@]}" 2> /dev/null
+    rm -rf "${fifo_dir}"
+}
+trap cleanup EXIT
+
+# -----------------------------------------------------------------------------
+# Replace the files of --readFilesIn (comma-separated lists per mate)
+# by named pipes fed by the decompressor
+# -----------------------------------------------------------------------------
+command=()
+read_files=false
+for argument in "$@"
+do
+    if [[ $argument == --* ]] ; then
+        read_files=false
+        [ "$argument" == "--readFilesIn" ] && read_files=true
+        command+=("$argument")
+        continue
+    fi
+    if [ "$read_files" = false ] ; then
+        command+=("$argument")
+        continue
+    fi
+    fifos=()
+    IFS="," read -r -a files <<< "$argument"
+    for file in "${files[@]}"
+    do
+        fifo="${fifo_dir}/${#writers[@]}.$(basename "${file%.gz}")"
+        mkfifo "$fifo"
+        # a decompressor per open of the pipe, which is then replaced by a
+        # fresh one: the reader of the previous pipe gets its end of file;
+        # a broken pipe (141) only means that the reader closed it early
+        (trap 'kill $pid 2> /dev/null; exit' TERM
+        while true
+        do
+            $decompress "$file" > "$fifo" &
+            pid=$!
+            wait $pid
+            status=$?
+            if [ $status -ne 0 ] && [ $status -ne 141 ] ; then
+                echo "Decompression of $file failed" >> "${fifo_dir}/failed"
+            fi
+            mkfifo "${fifo}.next" && mv -f "${fifo}.next" "$fifo"
+        done) > /dev/null &
+        writers+=($!)
+        fifos+=("$fifo")
+    done
+    command+=("$(IFS=","; echo "${fifos[*]}")")
+done
+
+"${command[@]}"
+status=$?
+
+if [ -s "${fifo_dir}/failed" ] ; then
+    cat "${fifo_dir}/failed" >&2
+    exit 1
+fi
+exit $status
@@ -0,0 +1,175 @@
+"""
+##############################################################################
+#
+#   Per-fastq quality metrics of the raw reads, derived from the JSON
+#   reports of fastp (adapter trimming) instead of a FastQC run.
+#
+#   fastp reports the reads of a sample before filtering per input file
+#   (read1: fq1 or the single-end file, read2: fq2) and the duplication,
+#   adapter and filtering statistics per sample. The position-wise curves
+#   (mean quality, GC and N content) are averaged over the read positions.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import time
+import json
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+from design_table import load_design_table, fastq_name
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--design-table",
+        dest="design_table",
+        required=True,
+        help="Design table of the analysis.",
+    )
+    parser.add_argument(
+        "--fastp-reports",
+        dest="fastp_reports",
+        required=True,
+        nargs="+",
+        help="JSON reports of fastp, named {sample}.json.",
+    )
+    parser.add_argument(
+        "--output",
+        dest="output",
+        required=True,
+        help="Output: quality metrics (one row per fastq file).",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def mean_of_curve(curve):
+    """Average of a position-wise curve of fastp (NaN if empty)."""
+    return sum(curve) / len(curve) if curve else float("nan")
+
+
+def fastq_metrics(reads):
+    """Metrics of a fastq file from its *_before_filtering section."""
+    total_reads = reads["total_reads"]
+    total_bases = reads["total_bases"]
+    return {
+        "total_reads": total_reads,
+        "total_bases": total_bases,
+        "mean_length": total_bases / total_reads if total_reads else 0.0,
+        "q20_rate": reads["q20_bases"] / total_bases if total_bases else 0.0,
+        "q30_rate": reads["q30_bases"] / total_bases if total_bases else 0.0,
+        "mean_quality": mean_of_curve(reads["quality_curves"]["mean"]),
+        "gc_content": mean_of_curve(reads["content_curves"]["GC"]),
+        "n_content": mean_of_curve(reads["content_curves"]["N"]),
+    }
+
+
+def sample_metrics(report):
+    """Metrics of a sample (all its fastq files) from a fastp report."""
+    total_reads = report["summary"]["before_filtering"]["total_reads"]
+    return {
+        "duplication_rate": report.get("duplication", {}).get("rate", 0.0),
+        "adapter_trimmed_reads": report.get("adapter_cutting", {}).get(
+            "adapter_trimmed_reads", 0
+        ),
+        "passed_filter_rate": (
+            report["filtering_result"]["passed_filter_reads"] / total_reads
+            if total_reads
+            else 0.0
+        ),
+    }
+
+
+def main():
+    """Main body of the script."""
+
+    design_table = load_design_table(options.design_table)
+    rows = []
+    for path in options.fastp_reports:
+        sample = os.path.basename(path)[: -len(".json")]
+        with open(path) as f:
+            report = json.load(f)
+        per_sample = sample_metrics(report)
+        # fastp reads the fastq files of a sample in the order fq1, fq2
+        sections = ["read1_before_filtering", "read2_before_filtering"]
+        for section, fastq in zip(sections, design_table.fastq_files(sample)):
+            row = {"fq_file": fastq_name(fastq), "sample": sample}
+            row.update(fastq_metrics(report[section]))
+            row.update(per_sample)
+            rows.append(row)
+
+    metrics = pd.DataFrame(rows)
+    metrics.to_csv(options.output, sep="\t", index=False)
+    logger.info(
+        "Metrics of {} fastq files in {} samples".format(
+            len(metrics), len(options.fastp_reports)
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
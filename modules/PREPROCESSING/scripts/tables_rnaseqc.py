@@ -0,0 +1,128 @@
+"""
+##############################################################################
+#
+#   RNA-SeQC data
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+###############################################################################
+"""
+# imports
+
+import os
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+from report_cache import ReportCache
+
+def parse_arguments():
+    '''Parser of the command-line arguments.'''
+    parser = ArgumentParser(description=__doc__,
+                            formatter_class=RawTextHelpFormatter)
+    parser.add_argument("-v",
+                        "--verbosity",
+                        dest="verbosity",
+                        choices=('DEBUG', 'INFO', 'WARN', 'ERROR', 'CRITICAL'),
+                        default='ERROR',
+                        help="Verbosity/Log level. Defaults to ERROR")
+    parser.add_argument("-l",
+                        "--logfile",
+                        dest="logfile",
+                        help="Store log to this file.")
+    parser.add_argument("--report-dirs",
+                        dest="report_dirs",
+                        required=True,
+                        nargs="+",
+                        help="Per-sample RNA-SeQC output directories.")
+    parser.add_argument("--metrics-suffix",
+                        dest="suffix",
+                        required=True,
+                        help="Suffix of the metrics table: <sample><suffix>.")
+    parser.add_argument("--output-tsv",
+                        dest="TSV",
+                        required=True,
+                        help="TSV file with RNA-SeQC information.")
+    parser.add_argument("--cache",
+                        dest="cache",
+                        default=":memory:",
+                        help="SQLite database with already parsed reports.")
+    parser.add_argument("--threads",
+                        dest="threads",
+                        type=int,
+                        default=1,
+                        help="Number of threads parsing new reports.")
+    return parser
+
+##############################################################################
+
+def read_rnaseqc_metrics(path, sample):
+    '''Read RNA-SeQC metrics table of a sample into a pd.Series.'''
+    temp = pd.read_csv(path, sep="\t", index_col=0,
+        na_values=['nan'], keep_default_na=False)
+    return pd.Series(temp.iloc[:, 0].values, index=temp.index, name=sample)
+
+
+def main():
+    '''Main body of the script.'''
+
+    reports = []
+    for report_dir in options.report_dirs:
+        # read the sample's results table
+        sample = report_dir.rstrip("/").split("/")[-1]
+        reports.append((sample, os.path.join(report_dir, sample + options.suffix)))
+
+    # parse only the reports which are new or changed since the last run
+    cache = ReportCache(options.cache, "RNASeQC")
+    columns = cache.collect(reports, read_rnaseqc_metrics, threads=options.threads)
+    cache.close()
+    logger.info("Parsed {} reports, {} loaded from the cache".format(
+        cache.n_parsed, cache.n_cached))
+
+    # merge tables and save the merged output
+    merged = pd.concat(columns, axis=1)
+    merged.to_csv(options.TSV, sep="\t")
+
+##############################################################################
+
+if __name__ == '__main__':
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(fmt="[%(asctime)s] %(levelname)s\
+                                      - %(message)s",
+                                      datefmt="%d-%b-%Y %H:%M:%S")
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger('uniprot_to_json')
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2)
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info("Successfully finished in {hours} hour(s) \
+{minutes} minute(s) and {seconds} second(s)",
+                    hours=int(hours),
+                    minutes=int(minutes),
+                    seconds=int(seconds) if seconds > 1.0 else 1)
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
@@ -18,6 +18,7 @@ import logging
 import logging.handlers
 from argparse import ArgumentParser, RawTextHelpFormatter
 import pandas as pd
+from report_cache import ReportCache
 
 def parse_arguments():
     '''Parser of the command-line arguments.'''
@@ -42,63 +43,88 @@ def parse_arguments():
                         dest="TSV",
                         required=True,
                         help="TSV file with STAR information.")
+    parser.add_argument("--cache",
+                        dest="cache",
+                        default=":memory:",
+                        help="SQLite database with already parsed reports.")
+    parser.add_argument("--threads",
+                        dest="threads",
+                        type=int,
+                        default=1,
+                        help="Number of threads parsing new reports.")
     return parser
 
 ##############################################################################
 
+STAR_LOG_ROWS = [
+    'Started job on',
+    'Started mapping on',
+    'Finished on',
+    'Mapping speed, Million of reads per hour',
+    'Number of input reads',
+    'Average input read length',
+    'UNIQUE READS:',
+    'Uniquely mapped reads number',
+    'Uniquely mapped reads %',
+    'Average mapped length',
+    'Number of splices: Total',
+    'Number of splices: Annotated (sjdb)',
+    'Number of splices: GT/AG',
+    'Number of splices: GC/AG',
+    'Number of splices: AT/AC',
+    'Number of splices: Non-canonical',
+    'Mismatch rate per base, %',
+    'Deletion rate per base',
+    'Deletion average length',
+    'Insertion rate per base',
+    'Insertion average length',
+    'MULTI-MAPPING READS:',
+    'Number of reads mapped to multiple loci',
+    '% of reads mapped to multiple loci',
+    'Number of reads mapped to too many loci',
+    '% of reads mapped to too many loci',
+    'UNMAPPED READS:',
+    'Number of reads unmapped: too many mismatches',
+    '% of reads unmapped: too many mismatches',
+    'Number of reads unmapped: too short',
+    '% of reads unmapped: too short',
+    'Number of reads unmapped: other',
+    '% of reads unmapped: other',
+    'CHIMERIC READS:',
+    'Number of chimeric reads',
+    '% of chimeric reads',
+]
+
+
+def read_star_log(path, sample):
+    '''Read STAR's Log.final.out of a sample into a pd.Series.'''
+    temp = pd.read_csv(path, sep="\t", index_col=0, header=None,
+        na_values=['nan'], keep_default_na=False)
+    return pd.Series(temp.iloc[:, 0].values, index=STAR_LOG_ROWS, name=sample)
+
+
 def main():
     '''Main body of the script.'''
 
-    df_list = []
+    reports = []
     for bam_path in options.samples:
         head_tail = os.path.split(bam_path)
         path = head_tail[0]
         sample = path.split("/")[-1]
         path = os.path.join(path,sample + '.Log.final.out')
-        temp = pd.read_csv(path, sep="\t", index_col=0, header=None,
-            na_values=['nan'], keep_default_na=False)
-        temp.reset_index(drop=True, inplace=True)
-        temp = temp.set_index([pd.Index(['Started job on',
-        'Started mapping on', 
-        'Finished on', 
-        'Mapping speed, Million of reads per hour', 
-        'Number of input reads', 
-        'Average input read length', 
-        'UNIQUE READS:', 
-        'Uniquely mapped reads number', 
-        'Uniquely mapped reads %', 
-        'Average mapped length', 
-        'Number of splices: Total', 
-        'Number of splices: Annotated (sjdb)', 
-        'Number of splices: GT/AG', 
-        'Number of splices: GC/AG', 
-        'Number of splices: AT/AC', 
-        'Number of splices: Non-canonical', 
-        'Mismatch rate per base, %', 
-        'Deletion rate per base', 
-        'Deletion average length', 
-        'Insertion rate per base', 
-        'Insertion average length', 
-        'MULTI-MAPPING READS:', 
-        'Number of reads mapped to multiple loci', 
-        '% of reads mapped to multiple loci', 
-        'Number of reads mapped to too many loci', 
-        '% of reads mapped to too many loci', 
-        'UNMAPPED READS:', 
-        'Number of reads unmapped: too many mismatches', 
-        '% of reads unmapped: too many mismatches', 
-        'Number of reads unmapped: too short', 
-        '% of reads unmapped: too short', 
-        'Number of reads unmapped: other', 
-        '% of reads unmapped: other', 
-        'CHIMERIC READS:', 
-        'Number of chimeric reads', 
-        '% of chimeric reads'])])
-        temp.loc['Sample'] = [sample]
-        temp.columns = temp.loc['Sample']
-        df_list.append(temp)
+        reports.append((sample, path))
+
+    # parse only the reports which are new or changed since the last run
+    cache = ReportCache(options.cache, "STAR")
+    columns = cache.collect(reports, read_star_log, threads=options.threads)
+    cache.close()
+    logger.info("Parsed {} reports, {} loaded from the cache".format(
+        cache.n_parsed, cache.n_cached))
+
     # merge tables and save the merged output
-    merged = pd.concat(df_list, axis=1)
+    merged = pd.concat(columns, axis=1)
+    merged.loc['Sample'] = merged.columns
+    merged.columns = pd.Index(merged.columns, name='Sample')
     merged.loc['Uniquely mapped reads %'] = merged.loc['Uniquely mapped reads %'].str.rstrip("%").astype(float)
     merged.loc['% of reads mapped to multiple loci'] = merged.loc['% of reads mapped to multiple loci'].str.rstrip("%").astype(float)
     merged.loc['% of reads mapped to too many loci'] = merged.loc['% of reads mapped to too many loci'].str.rstrip("%").astype(float)
@@ -28,6 +28,8 @@ from qcmodule import BED
 import numpy as np
 import pysam
 
+from coverage_cache import open_coverage_cache
+
 warnings.filterwarnings("ignore")
 
 __author__ = "Liguo Wang"
@@ -293,6 +295,27 @@ def genebody_coverage(samfile, chrom, positions, bg_level=0):
     return tmp
 
 
+def cached_genebody_coverage(cache_dir, chrom, positions, bg_level=0):
+    """
+    calculate coverage for each nucleotide in *positions* from the coverage
+    cache of the sample (both strands) instead of the pileup of the reads.
+    """
+    positions = np.unique(np.array(positions, dtype=np.int64))
+    cache = open_coverage_cache(cache_dir)
+    cvg = [float(i) for i in cache.values_at(chrom, positions - 1)]
+
+    if bg_level <= 0:
+        return cvg
+    tmp = []
+    for i in cvg:
+        subtracted_sig = int(i - bg_level)
+        if subtracted_sig > 0:
+            tmp.append(subtracted_sig)
+        else:
+            tmp.append(0)
+    return tmp
+
+
 def tin_score(cvg, length):
     """calculate TIN score"""
     tin = 0
@@ -319,6 +342,7 @@ def gf(arg_list):
         intron_size,
         pick_positions,
         sample_name,
+        coverage_cache,
         options,
         exon_ranges,
     ) = arg_list
@@ -345,9 +369,14 @@ def gf(arg_list):
             if intron_size > 0:
                 noise_level = intron_signals / intron_size
 
-        coverage = genebody_coverage(
-            samfile, i_chr, sorted(pick_positions), noise_level
-        )
+        if coverage_cache is not None:
+            coverage = cached_genebody_coverage(
+                coverage_cache, i_chr, pick_positions, noise_level
+            )
+        else:
+            coverage = genebody_coverage(
+                samfile, i_chr, sorted(pick_positions), noise_level
+            )
         tin1 = tin_score(cvg=coverage, length=len(pick_positions))
         sample_TINS_per_transcript[gname] = sample_TINS_per_transcript[gname] + [tin1]
 
@@ -443,6 +472,18 @@ def main():
             "Number of child processes for the parallelization. Default: 1"
         ),
     )
+    parser.add_option(
+        "--coverage-cache",
+        action="store",
+        type="string",
+        dest="coverage_caches",
+        help=(
+            "Coverage cache directories of the BAM files, comma separated "
+            "(no spaces allowed; see build-coverage-cache.py). The coverage "
+            "at the sampled positions is read from the caches instead of "
+            "the pileup of the reads."
+        ),
+    )
     (options, args) = parser.parse_args()
 
     # if '-s' was set
@@ -494,6 +535,18 @@ def main():
         )
         sys.exit(2)
 
+    if options.coverage_caches:
+        coverage_caches = options.coverage_caches.split(",")
+        if len(coverage_caches) != len(bamfiles):
+            print(
+                "[ERROR] Number of coverage caches does not match number of "
+                "bam files",
+                file=sys.stderr,
+            )
+            sys.exit(2)
+    else:
+        coverage_caches = [None] * len(bamfiles)
+
     # print header
     sys.stdout.write("transcript")
     for i in names:
@@ -507,7 +560,7 @@ def main():
         refbed=options.ref_gene_model, sample_size=options.sample_size
     )
 
-    for f in bamfiles:
+    for f, coverage_cache in zip(bamfiles, coverage_caches):
         printlog("Processing " + f)
 
         conditions = []
@@ -529,6 +582,7 @@ def main():
                     intron_size,
                     pick_positions,
                     f,
+                    coverage_cache,
                     options,
                     exon_ranges,
                 ]
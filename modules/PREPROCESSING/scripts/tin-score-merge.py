@@ -17,7 +17,10 @@ import time
 import logging
 import logging.handlers
 from argparse import ArgumentParser, RawTextHelpFormatter
+import os
+import numpy as np
 import pandas as pd
+from report_cache import ReportCache
 
 
 def parse_arguments():
@@ -41,22 +44,137 @@ def parse_arguments():
                         help="Space-separated paths to the input tables.")
     parser.add_argument("--output-file",
                         dest="outfile",
-                        required=True,
                         help="Path for the outfile with merged TIN scores.")
+    parser.add_argument("--matrix-dir",
+                        dest="matrix_dir",
+                        help="Directory for the merged TIN scores as a float32\n"
+                        "memory-mapped matrix (matrix.npy: transcripts x samples)\n"
+                        "with transcripts.txt and samples.txt.")
+    parser.add_argument("--out-of-core",
+                        dest="out_of_core",
+                        action="store_true",
+                        help="Stream one sample at a time into the matrix\n"
+                        "(requires --matrix-dir; the TSV is written from it).")
+    parser.add_argument("--chunk-size",
+                        dest="chunk_size",
+                        type=int,
+                        default=10000,
+                        help="Rows of the matrix written to the TSV at once.")
+    parser.add_argument("--cache",
+                        dest="cache",
+                        default=":memory:",
+                        help="SQLite database with already parsed tables.")
+    parser.add_argument("--threads",
+                        dest="threads",
+                        type=int,
+                        default=1,
+                        help="Number of threads parsing new tables.")
     return parser
 
 ##############################################################################
 
 
+def read_tin_table(path, sample):
+    '''Read per-sample TIN scores into a pd.Series.'''
+    return pd.read_csv(path, sep="\t", index_col=0).iloc[:, 0]
+
+
+def write_matrix_index(matrix_dir, transcripts, samples):
+    '''Save row (transcripts) and column (samples) labels of the matrix.'''
+    with open(os.path.join(matrix_dir, "transcripts.txt"), "w") as f:
+        f.write("".join([t + "\n" for t in transcripts]))
+    with open(os.path.join(matrix_dir, "samples.txt"), "w") as f:
+        f.write("".join([s + "\n" for s in samples]))
+
+
+def merge_out_of_core():
+    '''
+    Stream per-sample tables into a memory-mapped float32 matrix
+    aligned on the shared transcript index. The matrix is stored in
+    column-major (Fortran) order, so every sample is written to a
+    contiguous block of the file.
+    '''
+    # 1st pass: shared transcript index (order of the first appearance)
+    transcripts = {}
+    samples = []
+    for p in options.infiles:
+        header = pd.read_csv(p, sep="\t", index_col=0, nrows=0)
+        samples.append(header.columns[0])
+        for t in pd.read_csv(p, sep="\t", usecols=[0]).iloc[:, 0]:
+            transcripts.setdefault(t, len(transcripts))
+
+    # 2nd pass: one sample (column) at a time
+    os.makedirs(options.matrix_dir, exist_ok=True)
+    matrix = np.lib.format.open_memmap(
+        os.path.join(options.matrix_dir, "matrix.npy"),
+        mode="w+",
+        dtype=np.float32,
+        shape=(len(transcripts), len(samples)),
+        fortran_order=True,
+    )
+    for j, p in enumerate(options.infiles):
+        column = np.full(len(transcripts), np.nan, dtype=np.float32)
+        table = read_tin_table(p, samples[j])
+        rows = np.array([transcripts[t] for t in table.index], dtype=np.int64)
+        column[rows] = table.values
+        matrix[:, j] = column
+        matrix.flush()
+        logger.info("Merged sample: {}".format(samples[j]))
+    write_matrix_index(options.matrix_dir, list(transcripts), samples)
+    return matrix, list(transcripts), samples
+
+
+def write_tsv_from_matrix(matrix, transcripts, samples):
+    '''Write the merged TSV from the matrix, a chunk of rows at a time.'''
+    with open(options.outfile, "w") as f:
+        f.write("\t".join(["transcript"] + samples) + "\n")
+        for start in range(0, len(transcripts), options.chunk_size):
+            chunk = np.asarray(matrix[start:start + options.chunk_size])
+            lines = []
+            for t, row in zip(transcripts[start:start + options.chunk_size], chunk):
+                values = ["" if np.isnan(v) else str(v) for v in row]
+                lines.append("\t".join([t] + values) + "\n")
+            f.write("".join(lines))
+
+
 def main():
     '''Main body of the script.'''
 
-    df_list = []
-    for p in options.infiles:
-        df_list.append(pd.read_csv(p, sep="\t", index_col=0))
-    merged = pd.concat(df_list, axis=1, sort=False)
+    if options.outfile is None and options.matrix_dir is None:
+        raise Exception("At least one of --output-file / --matrix-dir is required.")
+
+    if options.out_of_core:
+        if options.matrix_dir is None:
+            raise Exception("--out-of-core requires --matrix-dir.")
+        matrix, transcripts, samples = merge_out_of_core()
+        if options.outfile is not None:
+            write_tsv_from_matrix(matrix, transcripts, samples)
+        return
+
+    reports = [(os.path.basename(p).rsplit(".", 1)[0], p) for p in options.infiles]
+
+    # parse only the tables which are new or changed since the last run
+    cache = ReportCache(options.cache, "TIN")
+    columns = cache.collect(reports, read_tin_table, threads=options.threads)
+    cache.close()
+    logger.info("Parsed {} tables, {} loaded from the cache".format(
+        cache.n_parsed, cache.n_cached))
+
+    merged = pd.concat(columns, axis=1, sort=False)
     merged.index.name = "transcript"
-    merged.to_csv(options.outfile, sep="\t", index=True, header=True)
+    if options.outfile is not None:
+        merged.to_csv(options.outfile, sep="\t", index=True, header=True)
+    if options.matrix_dir is not None:
+        os.makedirs(options.matrix_dir, exist_ok=True)
+        np.save(
+            os.path.join(options.matrix_dir, "matrix.npy"),
+            np.asfortranarray(merged.values, dtype=np.float32),
+        )
+        write_matrix_index(
+            options.matrix_dir,
+            [str(t) for t in merged.index],
+            [str(c) for c in merged.columns],
+        )
 
 ##############################################################################
 
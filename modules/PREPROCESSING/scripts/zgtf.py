@@ -16,9 +16,18 @@ def gtf_to_transcript_exons(gtf, transcript_type):
     key: trancsript_id
     value: list of exon entries
     """
+    return gtf_to_transcript_exons_by_type(gtf, [transcript_type])[transcript_type]
+
+def gtf_to_transcript_exons_by_type(gtf, transcript_types):
+    """
+    Parse gtf once and return a dictionary where
+    key: transcript_type
+    value: dictionary of trancsript_id -> list of exon entries
+    (only the requested transcript types are collected)
+    """
     gft = HTSeq.GFF_Reader(gtf)
 
-    transcripts = {}
+    transcripts = {tr_type: {} for tr_type in transcript_types}
 
     for gtf_line in gft:
         if gtf_line.type == 'exon':
@@ -29,13 +38,13 @@ def gtf_to_transcript_exons(gtf, transcript_type):
                 sys.stderr.write(f"Problem with: {gtf_line}. Exiting.{os.linesep}")
                 sys.exit(1)
 
-            if tr_type != transcript_type:
+            if tr_type not in transcripts:
                 continue
 
-            if tr_id not in transcripts:
-                transcripts[tr_id] = [gtf_line]
+            if tr_id not in transcripts[tr_type]:
+                transcripts[tr_type][tr_id] = [gtf_line]
             else:
-                transcripts[tr_id].append(gtf_line)
+                transcripts[tr_type][tr_id].append(gtf_line)
 
     return transcripts
 
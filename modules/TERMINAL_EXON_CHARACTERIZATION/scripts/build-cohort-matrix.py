@@ -0,0 +1,163 @@
+"""
+##############################################################################
+#
+#   Cohort-level matrix of the novel terminal exons.
+#
+#   The per-sample results (final_nte.tsv; the sample is the name of the
+#   enclosing directory) are synchronized with an incremental store (only
+#   new or changed results are loaded) and exported as a long-format table
+#   and as a sparse region x sample matrix of terminal probabilities
+#   (Matrix Market coordinate format with the row and column names).
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pandas as pd
+from cohort_store import TerminalExonStore
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--results",
+        dest="results",
+        required=True,
+        nargs="+",
+        help="Per-sample results ({sample}/final_nte.tsv).",
+    )
+    parser.add_argument(
+        "--store",
+        dest="store",
+        required=True,
+        help="SQLite store of the cohort (kept between runs).",
+    )
+    parser.add_argument(
+        "--output-long-tsv",
+        dest="output_long_tsv",
+        required=True,
+        help="Output: region, sample, terminal_probability.",
+    )
+    parser.add_argument(
+        "--output-matrix-dir",
+        dest="output_matrix_dir",
+        required=True,
+        help="Output: matrix.mtx, regions.tsv and samples.tsv.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def write_matrix(long_table, samples, directory):
+    """Sparse region x sample matrix in the Matrix Market format."""
+    os.makedirs(directory, exist_ok=True)
+    regions = sorted(long_table["region"].unique())
+    rows = pd.Series(range(1, len(regions) + 1), index=regions)
+    columns = pd.Series(range(1, len(samples) + 1), index=samples)
+    entries = pd.DataFrame({
+        "row": rows.loc[long_table["region"]].values,
+        "column": columns.loc[long_table["sample"]].values,
+        "value": long_table["terminal_probability"].values,
+    }).sort_values(["column", "row"])
+    with open(os.path.join(directory, "matrix.mtx"), "w") as mtx:
+        mtx.write("%%MatrixMarket matrix coordinate real general\n")
+        mtx.write("{} {} {}\n".format(len(regions), len(samples), len(entries)))
+        entries.to_csv(mtx, sep=" ", header=False, index=False)
+    pd.Series(regions).to_csv(
+        os.path.join(directory, "regions.tsv"), index=False, header=False
+    )
+    pd.Series(samples).to_csv(
+        os.path.join(directory, "samples.tsv"), index=False, header=False
+    )
+    return len(regions)
+
+
+def main():
+    """Main body of the script."""
+
+    results = [
+        (os.path.basename(os.path.dirname(os.path.abspath(path))), path)
+        for path in options.results
+    ]
+    store = TerminalExonStore(options.store)
+    store.update(results)
+    long_table = store.long_table()
+    store.close()
+
+    long_table.to_csv(options.output_long_tsv, sep="\t", index=False)
+    n_regions = write_matrix(
+        long_table, [sample for sample, _ in results], options.output_matrix_dir
+    )
+    logger.info(
+        "{} samples ({} loaded, {} unchanged), {} regions, {} entries".format(
+            len(results), store.n_loaded, store.n_cached, n_regions, len(long_table)
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
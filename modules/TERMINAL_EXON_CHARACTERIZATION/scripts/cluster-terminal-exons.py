@@ -0,0 +1,218 @@
+"""
+##############################################################################
+#
+#   Consensus novel terminal exons of a cohort.
+#
+#   The calls of all per-sample results (final_nte.tsv; the sample is the
+#   name of the enclosing directory) are sorted by start within every
+#   (chromosome, strand) and clustered in a single sweep: a call starts a
+#   new cluster if it starts more than a maximal distance downstream of
+#   the furthest end of the calls before it. Every cluster is reported
+#   with its span, median boundaries, support (calls, samples) and the
+#   statistics of the terminal probabilities of its calls.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import numpy as np
+import pandas as pd
+from terminal_exon_index import read_results
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--results",
+        dest="results",
+        required=True,
+        nargs="+",
+        help="Per-sample results ({sample}/final_nte.tsv).",
+    )
+    parser.add_argument(
+        "--max-distance",
+        dest="max_distance",
+        type=int,
+        default=0,
+        help="Maximal distance (bp) between the calls of a cluster.",
+    )
+    parser.add_argument(
+        "--output-consensus-tsv",
+        dest="output_consensus_tsv",
+        required=True,
+        help="Output: consensus terminal exons.",
+    )
+    parser.add_argument(
+        "--output-members-tsv",
+        dest="output_members_tsv",
+        required=True,
+        help="Output: calls with the clusters they belong to.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def cluster_calls(starts, ends, groups, max_distance):
+    """
+    Cluster index of every call (sorted by group and start; 0-based,
+    half-open coordinates): the groups are shifted apart so that a single
+    running maximum of the ends sweeps over all of them
+    """
+    if len(starts) == 0:
+        return np.array([], dtype=np.int64)
+    shift = groups.astype(np.int64) * (int(ends.max()) + max_distance + 1)
+    starts = starts + shift
+    max_ends = np.maximum.accumulate(ends + shift)
+    new_cluster = np.empty(len(starts), dtype=bool)
+    new_cluster[0] = True
+    new_cluster[1:] = starts[1:] - max_ends[:-1] > max_distance
+    return np.cumsum(new_cluster) - 1
+
+
+def join_unique(table, column):
+    """Sorted, distinct values of a column per cluster (comma-separated)."""
+    values = table[["cluster", column]].drop_duplicates()
+    values = values.sort_values(["cluster", column])
+    clusters = values["cluster"].values
+    # values of a cluster: consecutive rows, split at the cluster changes
+    boundaries = np.flatnonzero(np.diff(clusters)) + 1
+    firsts = [0] + boundaries.tolist()
+    lasts = boundaries.tolist() + [len(values)]
+    values = values[column].tolist()
+    return pd.Series(
+        [",".join(values[first:last]) for first, last in zip(firsts, lasts)]
+        if values else [],
+        index=clusters[firsts] if values else [],
+        dtype=object,
+    )
+
+
+def consensus_regions(calls):
+    """Consensus region, support and probabilities of every cluster."""
+    clusters = calls.groupby("cluster")
+    probabilities = clusters["terminal_probability"]
+    consensus = pd.DataFrame({
+        "chromosome": clusters["chromosome"].first(),
+        "start": clusters["start"].min() + 1,
+        "end": clusters["end"].max(),
+        "strand": clusters["strand"].first(),
+        "median_start": (clusters["start"].median() + 1).round().astype(np.int64),
+        "median_end": clusters["end"].median().round().astype(np.int64),
+        "n_calls": clusters.size(),
+        "n_samples": clusters["sample"].nunique(),
+        "mean_terminal_probability": probabilities.mean(),
+        "median_terminal_probability": probabilities.median(),
+        "min_terminal_probability": probabilities.min(),
+        "max_terminal_probability": probabilities.max(),
+        "samples": join_unique(calls, "sample"),
+        "gene_ids": join_unique(calls[calls["gene_id"] != ""], "gene_id"),
+    })
+    consensus["gene_ids"] = consensus["gene_ids"].fillna("")
+    consensus.insert(0, "region", (
+        consensus["chromosome"] + ":" + consensus["start"].astype(str) + ":"
+        + consensus["end"].astype(str) + ":" + consensus["strand"]
+    ))
+    consensus.index.name = "cluster"
+    return consensus
+
+
+def main():
+    """Main body of the script."""
+
+    results = [
+        (os.path.basename(os.path.dirname(os.path.abspath(path))), path)
+        for path in options.results
+    ]
+    calls, skipped = read_results(results)
+    calls = calls.sort_values(["chromosome", "strand", "start", "end"])
+    calls = calls.reset_index(drop=True)
+    groups = (
+        (calls["chromosome"] != calls["chromosome"].shift())
+        | (calls["strand"] != calls["strand"].shift())
+    ).cumsum().values
+    calls["cluster"] = cluster_calls(
+        calls["start"].values.astype(np.int64),
+        calls["end"].values.astype(np.int64),
+        groups,
+        options.max_distance,
+    )
+    consensus = consensus_regions(calls)
+
+    consensus.to_csv(options.output_consensus_tsv, sep="\t")
+    calls[[
+        "region", "sample", "gene_id", "terminal_probability", "cluster"
+    ]].to_csv(options.output_members_tsv, sep="\t", index=False)
+    logger.info(
+        "{} calls of {} samples clustered into {} consensus terminal exons, "
+        "{} unparsable regions skipped".format(
+            len(calls), len(results), len(consensus), skipped
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
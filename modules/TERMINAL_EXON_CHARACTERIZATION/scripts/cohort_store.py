@@ -0,0 +1,153 @@
+"""
+##############################################################################
+#
+#   Incremental, sparse store of the novel terminal exons of a cohort.
+#
+#   The terminal probabilities of the per-sample results (final_nte.tsv)
+#   are kept in an SQLite database as (sample, region, probability) entries:
+#   only the regions found in a sample are stored. Every result file is
+#   keyed by its fingerprint (modification time and size); on every run
+#   only new or changed files are re-loaded.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import sqlite3
+import pandas as pd
+
+
+def fingerprint(path):
+    """Modification time (ns) and size of a file."""
+    stat = os.stat(path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def read_terminal_probabilities(path):
+    """
+    Highest terminal probability per region of a per-sample result
+    (regions without a probability are left out)
+    """
+    table = pd.read_csv(path, sep="\t", index_col=0)
+    if "terminal_probability" not in table.columns or table.empty:
+        return pd.Series([], dtype=float, name="terminal_probability")
+    table = table.dropna(subset=["terminal_probability"])
+    return table.groupby("region")["terminal_probability"].max()
+
+
+class TerminalExonStore:
+    """
+    Sparse region x sample matrix of terminal probabilities
+    """
+
+    def __init__(self, db_path):
+        if db_path != ":memory:":
+            db_dir = os.path.dirname(os.path.abspath(db_path))
+            os.makedirs(db_dir, exist_ok=True)
+        self.connection = sqlite3.connect(db_path, timeout=600)
+        self.connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS samples (
+                sample_id INTEGER PRIMARY KEY,
+                sample TEXT NOT NULL UNIQUE,
+                path TEXT NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS regions (
+                region_id INTEGER PRIMARY KEY,
+                region TEXT NOT NULL UNIQUE
+            );
+            CREATE TABLE IF NOT EXISTS probabilities (
+                sample_id INTEGER NOT NULL,
+                region_id INTEGER NOT NULL,
+                terminal_probability REAL NOT NULL,
+                PRIMARY KEY (sample_id, region_id)
+            ) WITHOUT ROWID;
+            """
+        )
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def _is_current(self, sample, path, stamp):
+        row = self.connection.execute(
+            "SELECT path, mtime_ns, size FROM samples WHERE sample = ?",
+            (sample,),
+        ).fetchone()
+        return row is not None and (row[0], row[1], row[2]) == (path,) + stamp
+
+    def _remove(self, sample):
+        self.connection.execute(
+            "DELETE FROM probabilities WHERE sample_id = "
+            "(SELECT sample_id FROM samples WHERE sample = ?)",
+            (sample,),
+        )
+        self.connection.execute("DELETE FROM samples WHERE sample = ?", (sample,))
+
+    def _store(self, sample, path, stamp, probabilities):
+        self._remove(sample)
+        sample_id = self.connection.execute(
+            "INSERT INTO samples (sample, path, mtime_ns, size) "
+            "VALUES (?, ?, ?, ?)",
+            (sample, path, stamp[0], stamp[1]),
+        ).lastrowid
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO regions (region) VALUES (?)",
+            [(str(region),) for region in probabilities.index],
+        )
+        self.connection.executemany(
+            "INSERT INTO probabilities VALUES "
+            "(?, (SELECT region_id FROM regions WHERE region = ?), ?)",
+            [
+                (sample_id, str(region), float(probability))
+                for region, probability in probabilities.items()
+            ],
+        )
+
+    def update(self, results):
+        """
+        Synchronize the store with the per-sample results
+        results: list of (sample, path) tuples
+        Results absent from the store or changed on disk are (re-)loaded;
+        samples which are not listed are removed.
+        """
+        self.n_loaded = 0
+        for sample, path in results:
+            path = os.path.abspath(path)
+            stamp = fingerprint(path)
+            if not self._is_current(sample, path, stamp):
+                self._store(
+                    sample, path, stamp, read_terminal_probabilities(path)
+                )
+                self.n_loaded += 1
+        listed = set(sample for sample, _ in results)
+        stored = [
+            row[0] for row in self.connection.execute("SELECT sample FROM samples")
+        ]
+        for sample in stored:
+            if sample not in listed:
+                self._remove(sample)
+        self.connection.execute(
+            "DELETE FROM regions WHERE region_id NOT IN "
+            "(SELECT DISTINCT region_id FROM probabilities)"
+        )
+        self.connection.commit()
+        self.n_cached = len(results) - self.n_loaded
+
+    def long_table(self):
+        """Entries of the matrix: region, sample, terminal_probability."""
+        return pd.read_sql_query(
+            "SELECT regions.region, samples.sample, "
+            "probabilities.terminal_probability "
+            "FROM probabilities "
+            "JOIN regions ON regions.region_id = probabilities.region_id "
+            "JOIN samples ON samples.sample_id = probabilities.sample_id "
+            "ORDER BY regions.region, samples.sample",
+            self.connection,
+        )
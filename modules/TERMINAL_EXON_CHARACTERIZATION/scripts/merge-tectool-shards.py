@@ -0,0 +1,184 @@
+"""
+##############################################################################
+#
+#   Gather of the TECtool results of the chromosome shards of a sample
+#   into a single results directory (the layout of a whole-genome run).
+#
+#   The tables read by the workflow (TABLES) are concatenated in the order
+#   of the shards under a single header; the headers of all shards have to
+#   be the same. Annotations (.gtf) are concatenated, with the comment lines
+#   of the first shard only. All other files (intermediate tables, models,
+#   plots) cannot be merged and are kept per shard under shards/{shard}/.
+#   Shards on which TECtool did not run (no annotation) are empty.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import time
+import shutil
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+
+# tables of TECtool read by the workflow (plots, merge of both mates)
+TABLES = ["classified_as_terminal_with_probabilities.tsv"]
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--shards",
+        dest="shards",
+        required=True,
+        nargs="+",
+        help="TECtool results directories of the shards (in order).",
+    )
+    parser.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        required=True,
+        help="Output: merged TECtool results directory.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def relative_files(directory):
+    """Relative paths of all files under a directory."""
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            paths.append(os.path.relpath(os.path.join(root, name), directory))
+    return paths
+
+
+def merge_tables(paths, output):
+    """Concatenate tables under the header they all share."""
+    with open(output, "w") as out:
+        header = None
+        for path in paths:
+            with open(path) as f:
+                first = f.readline()
+                if header is None:
+                    header = first
+                    out.write(first)
+                elif first != header:
+                    raise ValueError(
+                        "Header of {} differs from the one of {}".format(
+                            path, paths[0]
+                        )
+                    )
+                shutil.copyfileobj(f, out)
+
+
+def merge_annotations(paths, output):
+    """Concatenate GTF files; comment lines of the first file only."""
+    with open(output, "w") as out:
+        for n, path in enumerate(paths):
+            with open(path) as f:
+                for line in f:
+                    if n == 0 or not line.startswith("#"):
+                        out.write(line)
+
+
+def main():
+    """Main body of the script."""
+
+    files = {}
+    for shard in options.shards:
+        for path in relative_files(shard):
+            files.setdefault(path, []).append(shard)
+
+    os.makedirs(options.output_dir, exist_ok=True)
+    merged = 0
+    for path, shards in sorted(files.items()):
+        sources = [os.path.join(shard, path) for shard in shards]
+        output = os.path.join(options.output_dir, path)
+        if path in TABLES:
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            merge_tables(sources, output)
+            merged += 1
+        elif path.endswith(".gtf"):
+            os.makedirs(os.path.dirname(output), exist_ok=True)
+            merge_annotations(sources, output)
+            merged += 1
+        else:
+            for shard, source in zip(shards, sources):
+                output = os.path.join(
+                    options.output_dir,
+                    "shards",
+                    os.path.basename(os.path.normpath(shard)),
+                    path,
+                )
+                os.makedirs(os.path.dirname(output), exist_ok=True)
+                shutil.copyfile(source, output)
+            logger.info("{} kept per shard".format(path))
+
+    logger.info(
+        "{} files merged from {} shards".format(merged, len(options.shards))
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
@@ -0,0 +1,467 @@
+"""
+##############################################################################
+#
+#   Batched plots of the novel terminal exons of a sample (one mate).
+#
+#   The annotation (genes of the novel terminal exons only; from the GTF or
+#   the compiled annotation store) and the poly(A) site atlas are read once. Every novel terminal exon is plotted on the
+#   span of its gene: read coverage (fetched from the indexed alignments
+#   for this window only, or read from the coverage cache of the sample),
+#   transcripts of the gene and poly(A) sites, with the novel exon
+#   highlighted. The plots are rendered by a pool of
+#   worker processes, optionally for the top N exons by terminal
+#   probability only.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import re
+import gzip
+import time
+import bisect
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+from multiprocessing import Pool
+import numpy as np
+import pandas as pd
+import pysam
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt  # noqa: E402
+from terminal_exon_index import parse_region  # noqa: E402
+from coverage_cache import open_coverage_cache  # noqa: E402
+from annotation_store import AnnotationStore, STRAND_SYMBOLS  # noqa: E402
+
+ATTRIBUTE = re.compile(r'(\S+) "([^"]*)"')
+MAX_TRANSCRIPTS = 12
+MAX_COVERAGE_BINS = 2000
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--tectool-results",
+        dest="tectool_results",
+        required=True,
+        help="TECtool results directory of the sample (one mate).",
+    )
+    annotation = parser.add_mutually_exclusive_group(required=True)
+    annotation.add_argument(
+        "--gtf",
+        dest="gtf",
+        help="Genomic annotation (GTF, optionally gzipped).",
+    )
+    annotation.add_argument(
+        "--annotation-store",
+        dest="annotation_store",
+        help="Annotation store compiled from the GTF, used instead of --gtf.",
+    )
+    parser.add_argument(
+        "--pas-atlas",
+        dest="pas_atlas",
+        required=True,
+        help="Poly(A) site atlas (BED).",
+    )
+    parser.add_argument(
+        "--bam",
+        dest="bam",
+        required=True,
+        help="Sorted and indexed alignments of the sample (one mate).",
+    )
+    parser.add_argument(
+        "--coverage-cache",
+        dest="coverage_cache",
+        help=(
+            "Coverage cache of the alignments (build-coverage-cache.py of the "
+            "PREPROCESSING module; read instead of the alignments)."
+        ),
+    )
+    parser.add_argument(
+        "--top-n",
+        dest="top_n",
+        type=int,
+        default=0,
+        help="Plot the N exons of highest terminal probability (0: all).",
+    )
+    parser.add_argument(
+        "--flank",
+        dest="flank",
+        type=int,
+        default=500,
+        help="Extension (bp) of the plotted windows on both sides.",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="threads",
+        type=int,
+        default=1,
+        help="Number of worker processes.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        required=True,
+        help="Output: one PDF file per novel terminal exon.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def open_text(path):
+    """Open a (gzipped) text file for reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def read_novel_exons(directory, top_n):
+    """
+    Novel terminal exons of a TECtool results directory with parsable
+    regions, by decreasing terminal probability (top N if N > 0)
+    """
+    path = os.path.join(directory, "classified_as_terminal_with_probabilities.tsv")
+    if not os.path.isfile(path):
+        return []
+    table = pd.read_csv(path, sep="\t")
+    if table.empty:
+        return []
+    if "terminal_probability" in table.columns:
+        table = table.sort_values("terminal_probability", ascending=False)
+    exons = []
+    for _, row in table.iterrows():
+        coordinates = parse_region(row["region"])
+        if coordinates is None:
+            continue
+        exons.append({
+            "region": str(row["region"]),
+            "gene_id": str(row.get("gene_id", "")),
+            "terminal_probability": row.get("terminal_probability", np.nan),
+            "chromosome": coordinates[0],
+            "start": coordinates[1],
+            "end": coordinates[2],
+            "strand": coordinates[3] or ".",
+        })
+        if 0 < top_n <= len(exons):
+            break
+    return exons
+
+
+def read_genes(path, gene_ids):
+    """
+    Spans and transcripts (exons; 0-based, half-open) of the given genes:
+    dictionary gene_id -> gene
+    """
+    genes = {}
+    with open_text(path) as gtf:
+        for line in gtf:
+            if line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 9 or fields[2] != "exon":
+                continue
+            attributes = dict(ATTRIBUTE.findall(fields[8]))
+            gene_id = attributes.get("gene_id")
+            if gene_id not in gene_ids:
+                continue
+            start, end = int(fields[3]) - 1, int(fields[4])
+            gene = genes.setdefault(gene_id, {
+                "name": attributes.get("gene_name", gene_id),
+                "chromosome": fields[0],
+                "strand": fields[6],
+                "start": start,
+                "end": end,
+                "transcripts": {},
+            })
+            gene["start"] = min(gene["start"], start)
+            gene["end"] = max(gene["end"], end)
+            gene["transcripts"].setdefault(
+                attributes.get("transcript_id", gene_id), []
+            ).append((start, end))
+    return genes
+
+
+def store_genes(store_dir, gene_ids):
+    """
+    Spans and transcripts (exons; 0-based, half-open) of the given genes
+    of an annotation store: dictionary gene_id -> gene
+    """
+    store = AnnotationStore(store_dir)
+    genes = {}
+    for gene_id in gene_ids:
+        try:
+            i = store.gene_id.index(gene_id)
+        except KeyError:
+            continue
+        transcripts = {}
+        for t in store.transcripts_of_gene(i):
+            exons = store.exons_of_transcript(t)
+            if len(exons) > 0:
+                transcripts[store.transcript_id[t]] = [
+                    (int(store.exon_start[e]) - 1, int(store.exon_end[e]))
+                    for e in exons
+                ]
+        if not transcripts:
+            continue
+        exons = [exon for exons in transcripts.values() for exon in exons]
+        genes[gene_id] = {
+            "name": store.gene_name[i],
+            "chromosome": store.chroms[int(store.gene_chrom[i])],
+            "strand": STRAND_SYMBOLS[int(store.gene_strand[i])],
+            "start": min(start for start, _ in exons),
+            "end": max(end for _, end in exons),
+            "transcripts": transcripts,
+        }
+    return genes
+
+
+def read_pas_atlas(path):
+    """
+    Poly(A) sites per chromosome, sorted by start:
+    dictionary chromosome -> (starts, sites)
+    """
+    atlas = {}
+    with open_text(path) as bed:
+        for line in bed:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 3 or not fields[1].isdigit():
+                # header lines
+                continue
+            strand = fields[5] if len(fields) > 5 else "."
+            atlas.setdefault(fields[0], []).append(
+                (int(fields[1]), int(fields[2]), strand)
+            )
+    for chromosome, sites in atlas.items():
+        sites.sort()
+        atlas[chromosome] = ([site[0] for site in sites], sites)
+    return atlas
+
+
+def sites_in_window(atlas, chromosome, start, end, strand):
+    """Poly(A) sites (on the strand, if known) within a window."""
+    if chromosome not in atlas:
+        return []
+    starts, sites = atlas[chromosome]
+    # sites are short: look back a bit for the ones reaching into the window
+    first = bisect.bisect_left(starts, start - 10000)
+    last = bisect.bisect_left(starts, end)
+    return [
+        site for site in sites[first:last]
+        if site[1] > start and (strand == "." or site[2] in (strand, "."))
+    ]
+
+
+def plot_jobs(exons, genes, atlas, flank, output_dir):
+    """Everything a worker needs to plot each exon (but the alignments)."""
+    jobs = []
+    for i, exon in enumerate(exons):
+        gene = genes.get(exon["gene_id"])
+        start, end = exon["start"], exon["end"]
+        transcripts = []
+        if gene is not None and gene["chromosome"] == exon["chromosome"]:
+            start, end = min(start, gene["start"]), max(end, gene["end"])
+            transcripts = sorted(gene["transcripts"].items())[:MAX_TRANSCRIPTS]
+        start, end = max(0, start - flank), end + flank
+        name = "{:04d}_{}".format(i + 1, re.sub(r"[^\w.+-]", "_", exon["region"]))
+        jobs.append({
+            "exon": exon,
+            "gene_name": gene["name"] if gene is not None else exon["gene_id"],
+            "window": (exon["chromosome"], start, end),
+            "transcripts": transcripts,
+            "sites": sites_in_window(
+                atlas, exon["chromosome"], start, end, exon["strand"]
+            ),
+            "path": os.path.join(output_dir, name + ".pdf"),
+        })
+    return jobs
+
+
+##############################################################################
+# worker processes: one open alignment file (or coverage cache) each
+
+alignments = None
+coverage_cache = None
+
+
+def open_alignments(path, cache_dir=None):
+    """Initializer of the worker processes."""
+    global alignments, coverage_cache
+    if cache_dir is not None:
+        coverage_cache = open_coverage_cache(cache_dir)
+    else:
+        alignments = pysam.AlignmentFile(path, "rb")
+
+
+def window_coverage(chromosome, start, end):
+    """
+    Read coverage of a window (indexed access to the window only),
+    averaged into at most MAX_COVERAGE_BINS bins: positions, coverage
+    """
+    if coverage_cache is not None:
+        if chromosome not in coverage_cache.index:
+            return np.array([start, end]), np.zeros(2)
+        coverage = coverage_cache.coverage(chromosome, start, end).astype(float)
+    else:
+        if chromosome not in alignments.references:
+            return np.array([start, end]), np.zeros(2)
+        coverage = np.sum(
+            alignments.count_coverage(
+                chromosome, start, end, quality_threshold=0, read_callback="all"
+            ),
+            axis=0,
+        ).astype(float)
+    bin_size = max(1, int(np.ceil(len(coverage) / float(MAX_COVERAGE_BINS))))
+    padding = (-len(coverage)) % bin_size
+    coverage = np.concatenate([coverage, np.zeros(padding)])
+    coverage = coverage.reshape(-1, bin_size).mean(axis=1)
+    return start + np.arange(len(coverage)) * bin_size, coverage
+
+
+def plot_exon(job):
+    """Render the plot of a novel terminal exon."""
+    exon = job["exon"]
+    chromosome, start, end = job["window"]
+    positions, coverage = window_coverage(chromosome, start, end)
+
+    figure, (ax_coverage, ax_transcripts, ax_sites) = plt.subplots(
+        3, 1, sharex=True, figsize=(10, 6),
+        gridspec_kw={"height_ratios": [3, 3, 1]},
+    )
+    ax_coverage.fill_between(positions, coverage, step="post", color="#4a6fa5")
+    ax_coverage.set_ylabel("Coverage")
+    ax_coverage.set_title("{} ({})  terminal probability: {:.3f}".format(
+        exon["region"], job["gene_name"], float(exon["terminal_probability"])
+    ))
+
+    for row, (transcript_id, exons) in enumerate(job["transcripts"]):
+        exons = sorted(exons)
+        ax_transcripts.plot(
+            [exons[0][0], exons[-1][1]], [row, row], color="black", lw=0.5
+        )
+        ax_transcripts.broken_barh(
+            [(s, e - s) for s, e in exons], (row - 0.3, 0.6), color="#555555"
+        )
+    ax_transcripts.set_yticks(range(len(job["transcripts"])))
+    ax_transcripts.set_yticklabels(
+        [transcript_id for transcript_id, _ in job["transcripts"]], fontsize=6
+    )
+    ax_transcripts.set_ylim(-1, max(1, len(job["transcripts"])))
+
+    ax_sites.broken_barh(
+        [(s, max(1, e - s)) for s, e, _ in job["sites"]], (0, 1), color="#c0392b"
+    )
+    ax_sites.set_yticks([])
+    ax_sites.set_ylabel("poly(A)\nsites", fontsize=8)
+    ax_sites.set_xlim(start, end)
+    ax_sites.set_xlabel(chromosome)
+
+    for ax in (ax_coverage, ax_transcripts, ax_sites):
+        ax.axvspan(exon["start"], exon["end"], color="#f1c40f", alpha=0.3)
+
+    figure.savefig(job["path"])
+    plt.close(figure)
+    return job["path"]
+
+
+##############################################################################
+
+
+def main():
+    """Main body of the script."""
+
+    os.makedirs(options.output_dir, exist_ok=True)
+    exons = read_novel_exons(options.tectool_results, options.top_n)
+    if not exons:
+        logger.info("No novel terminal exons to plot")
+        return
+
+    gene_ids = set(exon["gene_id"] for exon in exons)
+    if options.annotation_store is not None:
+        genes = store_genes(options.annotation_store, gene_ids)
+    else:
+        genes = read_genes(options.gtf, gene_ids)
+    atlas = read_pas_atlas(options.pas_atlas)
+    jobs = plot_jobs(exons, genes, atlas, options.flank, options.output_dir)
+
+    pool = Pool(
+        processes=max(1, options.threads),
+        initializer=open_alignments,
+        initargs=(options.bam, options.coverage_cache),
+    )
+    try:
+        plots = pool.map(plot_exon, jobs, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+
+    logger.info(
+        "{} novel terminal exons plotted with {} workers".format(
+            len(plots), options.threads
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
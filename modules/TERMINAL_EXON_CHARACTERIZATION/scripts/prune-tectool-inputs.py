@@ -0,0 +1,274 @@
+"""
+##############################################################################
+#
+#   Pruning of the genomic annotation and of the poly(A) site atlas
+#   to the genes with read support in a sample, before TECtool.
+#
+#   Gene spans (all features of a gene_id, extended by a flank; read from
+#   the compiled annotation store if given) are looked up in the BAM index: chromosomes without mapped reads are skipped
+#   altogether and the reads of a gene are only counted until the minimal
+#   support is reached. The records of the supported genes (in their
+#   original order) and the poly(A) sites overlapping their spans are
+#   written to the per-sample annotation and atlas.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import re
+import gzip
+import time
+import bisect
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pysam
+from annotation_store import AnnotationStore
+
+GENE_ID = re.compile(r'gene_id "([^"]+)"')
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--bam",
+        dest="bam",
+        required=True,
+        help="Sorted and indexed alignments of the sample.",
+    )
+    parser.add_argument(
+        "--gtf",
+        dest="gtf",
+        required=True,
+        help="Genomic annotation (GTF, optionally gzipped).",
+    )
+    parser.add_argument(
+        "--annotation-store",
+        dest="annotation_store",
+        help="Annotation store compiled from the GTF (gene spans).",
+    )
+    parser.add_argument(
+        "--pas-atlas",
+        dest="pas_atlas",
+        required=True,
+        help="Poly(A) site atlas (BED).",
+    )
+    parser.add_argument(
+        "--min-reads",
+        dest="min_reads",
+        type=int,
+        default=10,
+        help="Minimal number of alignments on the span of a gene.",
+    )
+    parser.add_argument(
+        "--flank",
+        dest="flank",
+        type=int,
+        default=1000,
+        help="Extension (bp) of the gene spans on both sides.",
+    )
+    parser.add_argument(
+        "--output-gtf",
+        dest="output_gtf",
+        required=True,
+        help="Output: annotation of the supported genes.",
+    )
+    parser.add_argument(
+        "--output-pas-atlas",
+        dest="output_pas_atlas",
+        required=True,
+        help="Output: poly(A) sites on the supported genes.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def open_text(path):
+    """Open a (gzipped) text file for reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def read_gene_spans(path):
+    """Spans (chromosome, start, end; 0-based) of all genes of a GTF."""
+    spans = {}
+    with open_text(path) as gtf:
+        for line in gtf:
+            if line.startswith("#"):
+                continue
+            fields = line.split("\t", 8)
+            match = GENE_ID.search(fields[8])
+            if match is None:
+                continue
+            start, end = int(fields[3]) - 1, int(fields[4])
+            span = spans.get(match.group(1))
+            if span is None:
+                spans[match.group(1)] = [fields[0], start, end]
+            else:
+                span[1] = min(span[1], start)
+                span[2] = max(span[2], end)
+    return spans
+
+
+def store_gene_spans(store_dir):
+    """Spans (chromosome, start, end; 0-based) of all genes of a store."""
+    store = AnnotationStore(store_dir)
+    return {
+        store.gene_id[i]: [
+            store.chroms[int(store.gene_chrom[i])],
+            int(store.gene_start[i]) - 1,
+            int(store.gene_end[i]),
+        ]
+        for i in range(store.n_genes)
+    }
+
+
+def is_supported(bam, chromosome, start, end, min_reads):
+    """Whether a region has at least min_reads alignments."""
+    reads = 0
+    for _ in bam.fetch(chromosome, max(0, start), end):
+        reads += 1
+        if reads >= min_reads:
+            return True
+    return False
+
+
+def merge_regions(regions):
+    """Per-chromosome sorted, merged regions: starts and ends."""
+    merged = {}
+    for chromosome, start, end in sorted(regions):
+        starts, ends = merged.setdefault(chromosome, ([], []))
+        if ends and start <= ends[-1]:
+            ends[-1] = max(ends[-1], end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return merged
+
+
+def overlaps(merged, chromosome, start, end):
+    """Whether an interval overlaps one of the merged regions."""
+    if chromosome not in merged:
+        return False
+    starts, ends = merged[chromosome]
+    i = bisect.bisect_left(starts, end) - 1
+    return i >= 0 and ends[i] > start
+
+
+def main():
+    """Main body of the script."""
+
+    if options.annotation_store is not None:
+        spans = store_gene_spans(options.annotation_store)
+    else:
+        spans = read_gene_spans(options.gtf)
+    supported = set()
+    regions = []
+    with pysam.AlignmentFile(options.bam, "rb") as bam:
+        mapped = {
+            stat.contig
+            for stat in bam.get_index_statistics()
+            if stat.mapped > 0
+        }
+        for gene_id, (chromosome, start, end) in spans.items():
+            if chromosome not in mapped:
+                continue
+            start, end = start - options.flank, end + options.flank
+            if is_supported(bam, chromosome, start, end, options.min_reads):
+                supported.add(gene_id)
+                regions.append((chromosome, max(0, start), end))
+
+    # records of the supported genes, in the order of the annotation
+    with open_text(options.gtf) as gtf, open(options.output_gtf, "w") as out:
+        for line in gtf:
+            if line.startswith("#"):
+                out.write(line)
+                continue
+            match = GENE_ID.search(line.split("\t", 8)[8])
+            if match is not None and match.group(1) in supported:
+                out.write(line)
+
+    # poly(A) sites on the spans of the supported genes
+    merged = merge_regions(regions)
+    sites = 0
+    with open_text(options.pas_atlas) as atlas, open(
+        options.output_pas_atlas, "w"
+    ) as out:
+        for line in atlas:
+            fields = line.split("\t", 3)
+            if len(fields) < 3 or not fields[1].isdigit():
+                # header lines
+                out.write(line)
+                continue
+            if overlaps(merged, fields[0], int(fields[1]), int(fields[2])):
+                out.write(line)
+                sites += 1
+
+    logger.info(
+        "{} of {} genes supported by at least {} alignments, {} poly(A) "
+        "sites kept".format(len(supported), len(spans), options.min_reads, sites)
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
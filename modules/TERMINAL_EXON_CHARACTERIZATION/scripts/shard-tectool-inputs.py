@@ -0,0 +1,360 @@
+"""
+##############################################################################
+#
+#   Scatter of the TECtool inputs of a sample into chromosome shards.
+#
+#   Chromosomes are weighted by their mapped reads (BAM index statistics)
+#   and assigned to a fixed number of shards with the longest-processing-
+#   time rule: the heaviest remaining chromosome goes to the lightest shard.
+#   Every shard gets the annotation, the poly(A) sites and the alignments
+#   of its chromosomes; chromosomes without mapped reads are left out.
+#   Shards without any chromosome get empty files.
+#
+#   TECtool trains its classifier on the annotated terminal exons of the
+#   shard, so a shard with too few of them covered by reads (e.g. a shard
+#   holding only the heavily covered mitochondrial chromosome) is merged
+#   into the lightest other shard, until every shard has the minimum or a
+#   single shard is left. The terminal exons are taken from the compiled
+#   annotation store if given (the GTF is then only split, not parsed).
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import gzip
+import time
+import heapq
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import numpy as np
+import pysam
+from annotation_store import AnnotationStore
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--bam",
+        dest="bam",
+        required=True,
+        help="Sorted and indexed alignments of the sample.",
+    )
+    parser.add_argument(
+        "--gtf",
+        dest="gtf",
+        required=True,
+        help="Genomic annotation (GTF, optionally gzipped).",
+    )
+    parser.add_argument(
+        "--annotation-store",
+        dest="annotation_store",
+        help="Annotation store compiled from the GTF (terminal exons).",
+    )
+    parser.add_argument(
+        "--pas-atlas",
+        dest="pas_atlas",
+        required=True,
+        help="Poly(A) site atlas (BED).",
+    )
+    parser.add_argument(
+        "--shards",
+        dest="shards",
+        type=int,
+        required=True,
+        help="Number of shards.",
+    )
+    parser.add_argument(
+        "--min-training-exons",
+        dest="min_training_exons",
+        type=int,
+        default=0,
+        help="Minimum number of annotated terminal exons with reads per\n"
+        "shard (0: no minimum). Defaults to 0",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="threads",
+        type=int,
+        default=1,
+        help="Number of threads compressing the alignments.",
+    )
+    parser.add_argument(
+        "--output-dir",
+        dest="output_dir",
+        required=True,
+        help="Output: shard_{1..N}.gtf/.bed/.bam/.bam.bai files.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def open_text(path):
+    """Open a (gzipped) text file for reading."""
+    if path.endswith(".gz"):
+        return gzip.open(path, "rt")
+    return open(path)
+
+
+def balanced_shards(weights, shards):
+    """
+    Chromosomes assigned to shards (longest processing time first):
+    dictionary chromosome -> shard index
+    """
+    loads = [(0, i) for i in range(shards)]
+    assignment = {}
+    for chromosome, weight in sorted(
+        weights.items(), key=lambda item: (-item[1], item[0])
+    ):
+        load, i = heapq.heappop(loads)
+        assignment[chromosome] = i
+        heapq.heappush(loads, (load + weight, i))
+    return assignment
+
+
+def attribute(attributes, name):
+    """Value of a GTF attribute (None if missing)."""
+    for field in attributes.split(";"):
+        field = field.strip()
+        if field.startswith(name + " "):
+            return field[len(name) + 1:].strip('"')
+    return None
+
+
+def read_terminal_exons(gtf):
+    """
+    Terminal exons (chromosome, start, end; 1-based) of the multi-exon
+    transcripts of a GTF
+    """
+    transcripts = {}
+    with open_text(gtf) as records:
+        for line in records:
+            if line.startswith("#"):
+                continue
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 9 or fields[2] != "exon":
+                continue
+            transcript = attribute(fields[8], "transcript_id")
+            if transcript is None:
+                continue
+            transcripts.setdefault(
+                transcript, (fields[0], fields[6], [])
+            )[2].append((int(fields[3]), int(fields[4])))
+
+    terminal = set()
+    for chromosome, strand, exons in transcripts.values():
+        if len(exons) < 2:
+            continue
+        last = max(exons) if strand == "+" else min(exons)
+        terminal.add((chromosome, last[0], last[1]))
+    return terminal
+
+
+def store_terminal_exons(store_dir):
+    """
+    Terminal exons (chromosome, start, end; 1-based) of the multi-exon
+    transcripts of an annotation store
+    """
+    store = AnnotationStore(store_dir)
+    offsets = np.asarray(store.transcript_exon_offsets)
+    starts = np.asarray(store.exon_start)
+    ends = np.asarray(store.exon_end)
+    # exons sorted by position within their transcript (kept contiguous)
+    order = np.lexsort((ends, starts, np.asarray(store.exon_transcript)))
+    transcripts = np.flatnonzero(np.diff(offsets) >= 2)
+    genes = np.asarray(store.transcript_gene)[transcripts]
+    last = np.where(
+        np.asarray(store.gene_strand)[genes] == 1,
+        order[offsets[transcripts + 1] - 1],
+        order[offsets[transcripts]],
+    )
+    chromosomes = np.asarray(store.gene_chrom)[genes]
+    return {
+        (store.chroms[int(c)], int(starts[i]), int(ends[i]))
+        for c, i in zip(chromosomes, last)
+    }
+
+
+def training_exons(terminal, bam):
+    """
+    Terminal exons covered by at least one read:
+    dictionary chromosome -> number of exons
+    """
+    counts = {}
+    references = set(bam.references)
+    for chromosome, start, end in terminal:
+        if chromosome not in references:
+            continue
+        if next(bam.fetch(chromosome, start - 1, end), None) is not None:
+            counts[chromosome] = counts.get(chromosome, 0) + 1
+    return counts
+
+
+def merge_small_shards(assignment, weights, exons, shards, minimum):
+    """
+    Shards with fewer than `minimum` training exons merged into the
+    lightest other shard (the shard with the fewest exons first)
+    """
+    while True:
+        used = sorted(set(assignment.values()))
+        counts = {
+            i: sum(exons.get(c, 0) for c, shard in assignment.items() if shard == i)
+            for i in used
+        }
+        small = [i for i in used if counts[i] < minimum]
+        if not small or len(used) < 2:
+            return assignment
+        shard = min(small, key=lambda i: (counts[i], i))
+        loads = {
+            i: sum(weights[c] for c, j in assignment.items() if j == i)
+            for i in used
+            if i != shard
+        }
+        target = min(loads, key=lambda i: (loads[i], i))
+        logger.warning(
+            "shard_{} has {} of {} training exons: merged into shard_{}".format(
+                shard + 1, counts[shard], minimum, target + 1
+            )
+        )
+        for chromosome, i in assignment.items():
+            if i == shard:
+                assignment[chromosome] = target
+
+
+def split_text_file(path, assignment, outputs):
+    """Write the records of a GTF/BED file to the shard of their chromosome."""
+    with open_text(path) as records:
+        for line in records:
+            if line.startswith(("#", "track", "browser")):
+                continue
+            shard = assignment.get(line.split("\t", 1)[0])
+            if shard is not None:
+                outputs[shard].write(line)
+
+
+def main():
+    """Main body of the script."""
+
+    os.makedirs(options.output_dir, exist_ok=True)
+    prefixes = [
+        os.path.join(options.output_dir, "shard_{}".format(i + 1))
+        for i in range(options.shards)
+    ]
+
+    with pysam.AlignmentFile(options.bam, "rb") as bam:
+        weights = {
+            stat.contig: stat.mapped
+            for stat in bam.get_index_statistics()
+            if stat.mapped > 0
+        }
+        assignment = balanced_shards(weights, options.shards)
+        exons = {}
+        if options.min_training_exons > 0:
+            if options.annotation_store is not None:
+                terminal = store_terminal_exons(options.annotation_store)
+            else:
+                terminal = read_terminal_exons(options.gtf)
+            exons = training_exons(terminal, bam)
+            assignment = merge_small_shards(
+                assignment, weights, exons, options.shards,
+                options.min_training_exons
+            )
+            total = sum(exons.values())
+            if total < options.min_training_exons:
+                logger.warning(
+                    "{} training exons in the whole sample, fewer than {}: "
+                    "TECtool may fail to train its classifier".format(
+                        total, options.min_training_exons
+                    )
+                )
+
+        # alignments: chromosomes in the order of the header (sorted output)
+        for i, prefix in enumerate(prefixes):
+            with pysam.AlignmentFile(
+                prefix + ".bam", "wb", template=bam, threads=options.threads
+            ) as out:
+                for chromosome in bam.references:
+                    if assignment.get(chromosome) == i:
+                        for read in bam.fetch(chromosome):
+                            out.write(read)
+            pysam.index(prefix + ".bam")
+
+    for extension, path in [(".gtf", options.gtf), (".bed", options.pas_atlas)]:
+        outputs = [open(prefix + extension, "w") for prefix in prefixes]
+        split_text_file(path, assignment, outputs)
+        for output in outputs:
+            output.close()
+
+    for i in range(options.shards):
+        logger.info(
+            "shard_{}: {} chromosomes, {} mapped reads, {} training exons".format(
+                i + 1,
+                sum(1 for shard in assignment.values() if shard == i),
+                sum(weights[c] for c, shard in assignment.items() if shard == i),
+                sum(exons.get(c, 0) for c, shard in assignment.items() if shard == i),
+            )
+        )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
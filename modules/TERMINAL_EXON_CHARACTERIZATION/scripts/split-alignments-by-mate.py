@@ -0,0 +1,210 @@
+"""
+##############################################################################
+#
+#   Splitting of the coordinate-sorted alignments of the PREPROCESSING module
+#   into the per-mate (F/R) alignments used by TECtool.
+#
+#   Mates are assigned as in the PREPROCESSING alignment: reads of the R
+#   fastq file are the first mates, reads of the F fastq file the second
+#   ones (reads of single-end samples: F). The records are written as
+#   single-end alignments in a single streaming pass; the coordinate order
+#   of the input is kept, so the outputs are only indexed.
+#
+#   STAR filters a pair by the length of the pair, so a mate can be kept
+#   with far fewer matched bases than a single-end alignment of the mate
+#   would need. The mates are filtered again one by one, with the matched
+#   bases and mismatches (NM) relative to the length of the mate, as in
+#   --outFilterMatchNminOverLread / --outFilterMismatchNoverLmax of the
+#   single-end runs. Alignment scores, multimapper counts and mates rescued
+#   by their pair are not recomputed.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+import pysam
+
+# pairing information, cleared in the single-end records
+PAIRED_FLAGS = 0x1 | 0x2 | 0x8 | 0x20 | 0x40 | 0x80
+
+# CIGAR operations of matched bases: M, =, X
+MATCH_OPERATIONS = (0, 7, 8)
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--bam",
+        dest="bam",
+        required=True,
+        help="Coordinate-sorted alignments of the PREPROCESSING module.",
+    )
+    parser.add_argument(
+        "--bam-F",
+        dest="bam_F",
+        required=True,
+        help="Output: alignments of the F reads (sorted).",
+    )
+    parser.add_argument(
+        "--bam-R",
+        dest="bam_R",
+        required=True,
+        help="Output: alignments of the R reads (sorted).",
+    )
+    parser.add_argument(
+        "--min-matched-fraction",
+        dest="min_matched_fraction",
+        type=float,
+        default=0.66,
+        help="Minimum number of matched bases of a mate relative to its\n"
+        "length (--outFilterMatchNminOverLread). Defaults to 0.66",
+    )
+    parser.add_argument(
+        "--max-mismatch-fraction",
+        dest="max_mismatch_fraction",
+        type=float,
+        default=0.1,
+        help="Maximum number of mismatches of a mate relative to its\n"
+        "matched bases (--outFilterMismatchNoverLmax). Defaults to 0.1",
+    )
+    parser.add_argument(
+        "--threads",
+        dest="threads",
+        type=int,
+        default=1,
+        help="Number of threads compressing the outputs.",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def passes_single_end_filters(read):
+    """Whether a mate passes the filters of a single-end alignment."""
+    if not read.is_paired:
+        return True
+    matched = sum(
+        length
+        for operation, length in read.cigartuples
+        if operation in MATCH_OPERATIONS
+    )
+    if matched < options.min_matched_fraction * read.infer_read_length():
+        return False
+    if read.has_tag("NM"):
+        return read.get_tag("NM") <= options.max_mismatch_fraction * matched
+    return True
+
+
+def as_single_end(read):
+    """Strip the pairing information from an alignment record."""
+    read.flag = read.flag & ~PAIRED_FLAGS
+    read.next_reference_id = -1
+    read.next_reference_start = -1
+    read.template_length = 0
+    if read.has_tag("MC"):
+        read.set_tag("MC", None)
+    return read
+
+
+def main():
+    """Main body of the script."""
+
+    counts = {"F": 0, "R": 0}
+    filtered = 0
+    with pysam.AlignmentFile(options.bam, "rb", threads=options.threads) as bam:
+        header = bam.header.to_dict()
+        header.setdefault("HD", {"VN": "1.4"})["SO"] = "coordinate"
+        outputs = {
+            "F": pysam.AlignmentFile(
+                options.bam_F, "wb", header=header, threads=options.threads
+            ),
+            "R": pysam.AlignmentFile(
+                options.bam_R, "wb", header=header, threads=options.threads
+            ),
+        }
+        for read in bam.fetch(until_eof=True):
+            # the single-end runs write no unmapped reads
+            if read.is_unmapped:
+                continue
+            if not passes_single_end_filters(read):
+                filtered += 1
+                continue
+            mate = "R" if read.is_paired and read.is_read1 else "F"
+            outputs[mate].write(as_single_end(read))
+            counts[mate] += 1
+        for output in outputs.values():
+            output.close()
+
+    pysam.index(options.bam_F)
+    pysam.index(options.bam_R)
+    logger.info(
+        "{} F and {} R alignment records, {} mates filtered".format(
+            counts["F"], counts["R"], filtered
+        )
+    )
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
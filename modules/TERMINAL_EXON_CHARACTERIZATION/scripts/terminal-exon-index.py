@@ -0,0 +1,240 @@
+"""
+##############################################################################
+#
+#   Interval index of the novel terminal exons of a cohort: build and query.
+#
+#   build        index the per-sample results (final_nte.tsv; the sample is
+#                the name of the enclosing directory) and a poly(A) atlas
+#   overlap      regions (with their samples) overlapping a query region
+#   nearest-pas  poly(A) site nearest to a query region
+#   gene         regions (with their samples) of a gene
+#   serve        answer the queries over HTTP (JSON), e.g.
+#                /overlap?region=chr7:1200000-1300000
+#                /nearest-pas?region=chr7:1200000-1300000:+
+#                /gene?gene_id=ENSG00000105974
+#
+#   Query regions are 1-based and inclusive, with an optional strand:
+#   chr7:1200000-1300000 or chr7:1200000:1300000:+
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import sys
+import json
+import time
+import logging
+import logging.handlers
+from argparse import ArgumentParser, RawTextHelpFormatter
+from http.server import HTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from terminal_exon_index import TerminalExonIndex, build_index, parse_region
+
+
+def parse_arguments():
+    """Parser of the command-line arguments."""
+    parser = ArgumentParser(description=__doc__, formatter_class=RawTextHelpFormatter)
+    parser.add_argument(
+        "-v",
+        "--verbosity",
+        dest="verbosity",
+        choices=("DEBUG", "INFO", "WARN", "ERROR", "CRITICAL"),
+        default="ERROR",
+        help="Verbosity/Log level. Defaults to ERROR",
+    )
+    parser.add_argument(
+        "-l", "--logfile", dest="logfile", help="Store log to this file."
+    )
+    parser.add_argument(
+        "--index-dir",
+        dest="index_dir",
+        required=True,
+        help="Directory of the index.",
+    )
+    commands = parser.add_subparsers(dest="command")
+    commands.required = True
+    build = commands.add_parser("build", help="Build the index.")
+    build.add_argument(
+        "--results",
+        dest="results",
+        required=True,
+        nargs="+",
+        help="Per-sample results ({sample}/final_nte.tsv).",
+    )
+    build.add_argument(
+        "--pas-atlas",
+        dest="pas_atlas",
+        help="Poly(A) site atlas (BED, optionally gzipped).",
+    )
+    for command in ["overlap", "nearest-pas"]:
+        query = commands.add_parser(command, help="Query a region.")
+        query.add_argument(
+            "regions",
+            nargs="+",
+            help="Query regions (chr:start-end[:strand]).",
+        )
+    gene = commands.add_parser("gene", help="Query a gene.")
+    gene.add_argument("gene_ids", nargs="+", help="Gene IDs.")
+    serve = commands.add_parser("serve", help="Answer queries over HTTP.")
+    serve.add_argument(
+        "--host",
+        dest="host",
+        default="127.0.0.1",
+        help="Address to listen on. Defaults to 127.0.0.1",
+    )
+    serve.add_argument(
+        "--port",
+        dest="port",
+        type=int,
+        default=8765,
+        help="Port to listen on. Defaults to 8765",
+    )
+    return parser
+
+
+##############################################################################
+
+
+def parse_query(region):
+    """Chromosome, 1-based start, end and strand of a query region."""
+    coordinates = parse_region(region)
+    if coordinates is None:
+        raise ValueError("Invalid region: {}".format(region))
+    chromosome, start, end, strand = coordinates
+    return chromosome, start + 1, end, strand
+
+
+def query(index, command, value):
+    """Result of a query: table (overlap, gene) or dictionary (nearest-pas)."""
+    if command == "gene":
+        return index.gene(value)
+    if command == "overlap":
+        return index.overlap(*parse_query(value))
+    if command == "nearest-pas":
+        return index.nearest_pas(*parse_query(value))
+    raise ValueError("Unknown query: {}".format(command))
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """HTTP (GET) queries of an index; JSON responses."""
+
+    index = None
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        command = url.path.strip("/")
+        arguments = parse_qs(url.query)
+        value = arguments.get("gene_id" if command == "gene" else "region")
+        try:
+            if value is None:
+                raise ValueError("Missing query argument")
+            result = query(self.index, command, value[0])
+            if result is None or isinstance(result, dict):
+                status, body = 200, json.dumps(result)
+            else:
+                status, body = 200, result.to_json(orient="records")
+        except ValueError as e:
+            status, body = 400, json.dumps({"error": str(e)})
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(body.encode())
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+def main():
+    """Main body of the script."""
+
+    if options.command == "build":
+        results = [
+            (os.path.basename(os.path.dirname(os.path.abspath(path))), path)
+            for path in options.results
+        ]
+        regions, sites, skipped = build_index(
+            results, options.index_dir, options.pas_atlas
+        )
+        logger.info(
+            "{} regions of {} samples and {} poly(A) sites indexed, {} "
+            "unparsable regions skipped".format(
+                regions, len(results), sites, skipped
+            )
+        )
+        return
+
+    index = TerminalExonIndex(options.index_dir)
+    if options.command == "serve":
+        QueryHandler.index = index
+        server = HTTPServer((options.host, options.port), QueryHandler)
+        logger.info("Serving on {}:{}".format(options.host, options.port))
+        server.serve_forever()
+        return
+
+    values = options.gene_ids if options.command == "gene" else options.regions
+    header = True
+    for value in values:
+        result = query(index, options.command, value)
+        if result is None:
+            continue
+        if isinstance(result, dict):
+            keys = list(result.keys())
+            if header:
+                sys.stdout.write("query\t" + "\t".join(keys) + "\n")
+            sys.stdout.write(
+                value + "\t" + "\t".join(str(result[k]) for k in keys) + "\n"
+            )
+        else:
+            result.insert(0, "query", value)
+            result.to_csv(sys.stdout, sep="\t", index=False, header=header)
+        header = False
+
+
+##############################################################################
+
+if __name__ == "__main__":
+
+    try:
+        # parse the command-line arguments
+        options = parse_arguments().parse_args()
+
+        # set up logging during the execution
+        formatter = logging.Formatter(
+            fmt="[%(asctime)s] %(levelname)s - %(message)s",
+            datefmt="%d-%b-%Y %H:%M:%S",
+        )
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        logger = logging.getLogger("logger")
+        logger.setLevel(logging.getLevelName(options.verbosity))
+        logger.addHandler(console_handler)
+        if options.logfile is not None:
+            logfile_handler = logging.handlers.RotatingFileHandler(
+                options.logfile, maxBytes=50000, backupCount=2
+            )
+            logfile_handler.setFormatter(formatter)
+            logger.addHandler(logfile_handler)
+
+        # execute the body of the script
+        start_time = time.time()
+        logger.info("Starting script")
+        main()
+        seconds = time.time() - start_time
+
+        # log the execution time
+        minutes, seconds = divmod(seconds, 60)
+        hours, minutes = divmod(minutes, 60)
+        logger.info(
+            "Successfully finished in {hours}h:{minutes}m:{seconds}s",
+            hours=int(hours),
+            minutes=int(minutes),
+            seconds=int(seconds) if seconds > 1.0 else 1,
+        )
+    # log the exception in case it happens
+    except Exception as e:
+        logger.exception(str(e))
+        raise e
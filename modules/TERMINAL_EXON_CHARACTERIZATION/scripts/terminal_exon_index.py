@@ -0,0 +1,332 @@
+"""
+##############################################################################
+#
+#   On-disk interval index of the novel terminal exons of a cohort.
+#
+#   The regions of all per-sample results (final_nte.tsv) and the sites
+#   of the poly(A) site atlas are stored as numpy arrays, sorted by start
+#   within every (chromosome, strand) segment, together with the running
+#   maximum of the ends of every segment. The arrays are memory-mapped on
+#   opening, so overlap and nearest-site queries are binary searches and
+#   per-gene queries are slices of a gene-sorted order.
+#
+#   Coordinates are 1-based and inclusive on input and output (as in the
+#   regions, e.g. chr7:1200000:1300000:+ or chr7:1200000-1300000) and
+#   0-based, half-open in the arrays.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import re
+import json
+import gzip
+import numpy as np
+import pandas as pd
+
+REGION = re.compile(
+    r"^(?P<chrom>.+?):(?P<start>\d+)[:-](?P<end>\d+)(?::(?P<strand>[+.-]))?$"
+)
+STRANDS = ("+", "-", ".")
+INDEX_FILE = "index.json"
+
+
+def parse_region(region):
+    """
+    Chromosome, 0-based start, end and strand (None if missing)
+    of a region string; None if the string is not a region
+    """
+    match = REGION.match(str(region).replace(",", ""))
+    if match is None:
+        return None
+    return (
+        match.group("chrom"),
+        int(match.group("start")) - 1,
+        int(match.group("end")),
+        match.group("strand"),
+    )
+
+
+def read_results(results):
+    """
+    Regions of the per-sample results: list of (sample, path) tuples;
+    the unparsable regions are counted and left out
+    """
+    tables = []
+    skipped = 0
+    for sample, path in results:
+        table = pd.read_csv(path, sep="\t", index_col=0)
+        if table.empty or "region" not in table.columns:
+            continue
+        coordinates = [parse_region(region) for region in table["region"]]
+        valid = [c is not None for c in coordinates]
+        skipped += len(valid) - sum(valid)
+        table = table[valid]
+        coordinates = [c for c in coordinates if c is not None]
+        tables.append(pd.DataFrame({
+            "chromosome": [c[0] for c in coordinates],
+            "start": [c[1] for c in coordinates],
+            "end": [c[2] for c in coordinates],
+            "strand": [c[3] or "." for c in coordinates],
+            "region": table["region"].astype(str).values,
+            "sample": sample,
+            "gene_id": table["gene_id"].fillna("").astype(str).values
+            if "gene_id" in table.columns else "",
+            "terminal_probability": table["terminal_probability"].values
+            if "terminal_probability" in table.columns else np.nan,
+        }))
+    columns = [
+        "chromosome", "start", "end", "strand", "region",
+        "sample", "gene_id", "terminal_probability",
+    ]
+    if not tables:
+        return pd.DataFrame(columns=columns), skipped
+    return pd.concat(tables, ignore_index=True)[columns], skipped
+
+
+def read_pas_atlas(path):
+    """Poly(A) sites of a BED file (optionally gzipped)."""
+    sites = []
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "rt") as bed:
+        for line in bed:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) < 3 or not fields[1].isdigit():
+                # header lines
+                continue
+            sites.append((
+                fields[0],
+                int(fields[1]),
+                int(fields[2]),
+                fields[5] if len(fields) > 5 and fields[5] in STRANDS else ".",
+                fields[3] if len(fields) > 3 else "",
+            ))
+    return pd.DataFrame(
+        sites, columns=["chromosome", "start", "end", "strand", "name"]
+    )
+
+
+def encode(values):
+    """Integer codes of the values and the list of distinct values."""
+    names = sorted(set(values))
+    codes = {name: i for i, name in enumerate(names)}
+    return np.array([codes[v] for v in values], dtype=np.int32), names
+
+
+def write_intervals(table, directory, prefix):
+    """
+    Sorted interval arrays of a table; (chromosome, strand) segments:
+    dictionary "chromosome<TAB>strand" -> [first, last + 1]
+    """
+    table = table.sort_values(["chromosome", "strand", "start", "end"])
+    table = table.reset_index(drop=True)
+    starts = table["start"].values.astype(np.int64)
+    ends = table["end"].values.astype(np.int64)
+    max_ends = np.empty_like(ends)
+    segments = {}
+    for (chromosome, strand), rows in table.groupby(["chromosome", "strand"]):
+        first, last = rows.index.min(), rows.index.max() + 1
+        segments[chromosome + "\t" + strand] = [int(first), int(last)]
+        max_ends[first:last] = np.maximum.accumulate(ends[first:last])
+    np.save(os.path.join(directory, prefix + "start.npy"), starts)
+    np.save(os.path.join(directory, prefix + "end.npy"), ends)
+    np.save(os.path.join(directory, prefix + "max_end.npy"), max_ends)
+    return table, segments
+
+
+def write_names(names, path):
+    with open(path, "w") as f:
+        for name in names:
+            f.write(name + "\n")
+
+
+def build_index(results, directory, pas_atlas=None):
+    """
+    Write the index of the per-sample results (list of (sample, path)
+    tuples) and of a poly(A) site atlas (optional) into a directory;
+    returns the number of regions, sites and unparsable regions
+    """
+    os.makedirs(directory, exist_ok=True)
+    regions, skipped = read_results(results)
+    regions, segments = write_intervals(regions, directory, "")
+    for column in ["region", "sample", "gene_id"]:
+        codes, names = encode(list(regions[column]))
+        np.save(os.path.join(directory, column + ".npy"), codes)
+        write_names(names, os.path.join(directory, column + "s.txt"))
+        if column == "gene_id":
+            # rows grouped by gene: gene_order[gene_offsets[i]:...[i + 1]]
+            order = np.argsort(codes, kind="mergesort").astype(np.int64)
+            offsets = np.searchsorted(
+                codes[order], np.arange(len(names) + 1)
+            ).astype(np.int64)
+            np.save(os.path.join(directory, "gene_order.npy"), order)
+            np.save(os.path.join(directory, "gene_offsets.npy"), offsets)
+    np.save(
+        os.path.join(directory, "terminal_probability.npy"),
+        regions["terminal_probability"].values.astype(np.float64),
+    )
+
+    if pas_atlas is not None:
+        sites = read_pas_atlas(pas_atlas)
+    else:
+        sites = pd.DataFrame(
+            columns=["chromosome", "start", "end", "strand", "name"]
+        )
+    sites, pas_segments = write_intervals(sites, directory, "pas_")
+    # the site with the highest end so far (nearest upstream site)
+    ends = sites["end"].values.astype(np.int64)
+    argmax = np.arange(len(ends), dtype=np.int64)
+    for first, last in pas_segments.values():
+        for i in range(first + 1, last):
+            if ends[argmax[i - 1]] >= ends[i]:
+                argmax[i] = argmax[i - 1]
+    np.save(os.path.join(directory, "pas_argmax_end.npy"), argmax)
+    codes, names = encode(list(sites["name"].astype(str)))
+    np.save(os.path.join(directory, "pas_name.npy"), codes)
+    write_names(names, os.path.join(directory, "pas_names.txt"))
+    np.save(
+        os.path.join(directory, "pas_strand.npy"),
+        np.array([STRANDS.index(s) for s in sites["strand"]], dtype=np.int8),
+    )
+    np.save(
+        os.path.join(directory, "strand.npy"),
+        np.array([STRANDS.index(s) for s in regions["strand"]], dtype=np.int8),
+    )
+
+    with open(os.path.join(directory, INDEX_FILE), "w") as f:
+        json.dump(
+            {"segments": segments, "pas_segments": pas_segments},
+            f, indent=1, sort_keys=True,
+        )
+    return len(regions), len(sites), skipped
+
+
+class TerminalExonIndex:
+    """
+    Queries of an index written by build_index (arrays memory-mapped)
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        with open(os.path.join(directory, INDEX_FILE)) as f:
+            index = json.load(f)
+        self.segments = index["segments"]
+        self.pas_segments = index["pas_segments"]
+        self.arrays = {}
+        self.names = {}
+        for column in ["region", "sample", "gene_id", "pas_name"]:
+            path = os.path.join(directory, column + "s.txt")
+            with open(path) as f:
+                self.names[column] = f.read().splitlines()
+        self.gene_codes = {
+            gene: i for i, gene in enumerate(self.names["gene_id"])
+        }
+        # chromosomes of the array positions: segments by their first row
+        firsts = sorted(
+            (first, key.split("\t")[0])
+            for key, (first, last) in self.segments.items() if last > first
+        )
+        self.segment_firsts = np.array([f for f, _ in firsts], dtype=np.int64)
+        self.segment_chromosomes = [c for _, c in firsts]
+
+    def _array(self, name):
+        if name not in self.arrays:
+            self.arrays[name] = np.load(
+                os.path.join(self.directory, name + ".npy"), mmap_mode="r"
+            )
+        return self.arrays[name]
+
+    def _keys(self, segments, chromosome, strand):
+        strands = STRANDS if strand is None else [strand]
+        return [
+            chromosome + "\t" + s
+            for s in strands if chromosome + "\t" + s in segments
+        ]
+
+    def _rows(self, rows):
+        """Table of the regions at the given array positions."""
+        rows = np.asarray(rows, dtype=np.int64)
+        segments = np.searchsorted(self.segment_firsts, rows, "right") - 1
+        return pd.DataFrame({
+            "chromosome": [self.segment_chromosomes[i] for i in segments],
+            "region": [self.names["region"][i] for i in self._array("region")[rows]],
+            "sample": [self.names["sample"][i] for i in self._array("sample")[rows]],
+            "gene_id": [self.names["gene_id"][i] for i in self._array("gene_id")[rows]],
+            "terminal_probability": np.array(self._array("terminal_probability")[rows]),
+            "start": np.array(self._array("start")[rows]) + 1,
+            "end": np.array(self._array("end")[rows]),
+            "strand": [STRANDS[i] for i in self._array("strand")[rows]],
+        }, columns=[
+            "region", "sample", "gene_id", "terminal_probability",
+            "chromosome", "start", "end", "strand",
+        ])
+
+    def overlap(self, chromosome, start, end, strand=None):
+        """
+        Regions (of all samples) overlapping chromosome:start-end
+        (1-based, inclusive), on one strand or on both
+        """
+        starts, ends = self._array("start"), self._array("end")
+        max_ends = self._array("max_end")
+        rows = []
+        for key in self._keys(self.segments, chromosome, strand):
+            first, last = self.segments[key]
+            # regions starting before the end of the query...
+            last = first + np.searchsorted(starts[first:last], end, "left")
+            # ...from the first one which may reach into the query
+            first += np.searchsorted(max_ends[first:last], start - 1, "right")
+            candidates = np.arange(first, last)
+            rows.append(candidates[ends[first:last] > start - 1])
+        rows = np.concatenate(rows) if rows else np.array([], dtype=np.int64)
+        return self._rows(rows).sort_values(["start", "end", "sample"])
+
+    def samples(self, chromosome, start, end, strand=None):
+        """Samples with a region overlapping chromosome:start-end."""
+        return sorted(set(self.overlap(chromosome, start, end, strand)["sample"]))
+
+    def nearest_pas(self, chromosome, start, end, strand=None):
+        """
+        Poly(A) site nearest to chromosome:start-end (1-based, inclusive;
+        on one strand or on both): dictionary with the site and its
+        distance (0 if overlapping); None if the chromosome has no sites
+        """
+        starts, ends = self._array("pas_start"), self._array("pas_end")
+        max_ends, argmax = self._array("pas_max_end"), self._array("pas_argmax_end")
+        best = None
+        for key in self._keys(self.pas_segments, chromosome, strand):
+            first, last = self.pas_segments[key]
+            i = first + np.searchsorted(starts[first:last], end, "left")
+            if i > first:
+                # furthest-reaching site starting before the query end
+                distance = max(0, start - 1 - int(max_ends[i - 1]))
+                if best is None or distance < best[0]:
+                    best = (distance, int(argmax[i - 1]))
+            if i < last:
+                # first site starting after the query end
+                distance = int(starts[i]) - end
+                if best is None or distance < best[0]:
+                    best = (distance, int(i))
+        if best is None:
+            return None
+        distance, j = best
+        return {
+            "name": self.names["pas_name"][self._array("pas_name")[j]],
+            "chromosome": chromosome,
+            "start": int(starts[j]) + 1,
+            "end": int(ends[j]),
+            "strand": STRANDS[self._array("pas_strand")[j]],
+            "distance": distance,
+        }
+
+    def gene(self, gene_id):
+        """Regions (of all samples) of a gene."""
+        code = self.gene_codes.get(gene_id)
+        if code is None:
+            return self._rows([])
+        offsets = self._array("gene_offsets")
+        rows = self._array("gene_order")[offsets[code]:offsets[code + 1]]
+        return self._rows(rows).sort_values(["start", "end", "sample"])
@@ -14,8 +14,6 @@
 
 # imports
 import pandas as pd
-import matplotlib.pyplot as plt
-import yaml
 import os
 import time
 import logging
@@ -64,27 +62,62 @@ def parse_arguments():
 
 
 
+def read_classified_regions(directory):
+    """TECtool regions classified as terminal (empty if not created)."""
+    path = Path(os.path.join(
+        directory, "classified_as_terminal_with_probabilities.tsv"
+    ))
+    if path.is_file():
+        return pd.read_csv(path, sep="\t")
+    return pd.DataFrame(columns=["region"])
+
+
+def select_common_regions(forward, reverse):
+    """
+    Regions found in both directions: every (forward, reverse) pair of rows
+    with the same region, joined on a hash of the regions, keeps the row
+    with the higher terminal_probability (reverse on ties), in the order
+    of the forward rows
+    """
+    if forward.empty or reverse.empty:
+        return pd.DataFrame()
+    pairs = pd.merge(
+        pd.DataFrame({
+            "region": forward["region"].values,
+            "probability_forward": forward["terminal_probability"].values,
+            "row_forward": np.arange(len(forward)),
+        }),
+        pd.DataFrame({
+            "region": reverse["region"].values,
+            "probability_reverse": reverse["terminal_probability"].values,
+            "row_reverse": np.arange(len(reverse)),
+        }),
+        on="region",
+        how="inner",
+    ).sort_values(["row_forward", "row_reverse"], kind="stable")
+    pairs["order"] = np.arange(len(pairs))
+
+    # pairs with a missing probability are not resolved
+    take_reverse = pairs["probability_reverse"] >= pairs["probability_forward"]
+    take_forward = pairs["probability_reverse"] < pairs["probability_forward"]
+    chosen = pd.concat(
+        [
+            reverse.iloc[pairs.loc[take_reverse, "row_reverse"].values]
+            .assign(_order=pairs.loc[take_reverse, "order"].values),
+            forward.iloc[pairs.loc[take_forward, "row_forward"].values]
+            .assign(_order=pairs.loc[take_forward, "order"].values),
+        ]
+    )
+    return chosen.sort_values("_order", kind="stable").drop(columns="_order")
+
+
 def main():
     """Main body of the script."""
 
-    # Checking if the forward file has been created
-    path_to_file_forward = os.path.join(options.forward_tsv,"classified_as_terminal_with_probabilities.tsv")
-    path_forward = Path(path_to_file_forward)
-
-    if path_forward.is_file():
-        FORWARD = pd.read_csv(path_to_file_forward, sep="\t")
-    else:
-        FORWARD = pd.DataFrame(columns=['region'])
-    
-    # Checking if the reverse file has been created
-    path_to_file_reverse = os.path.join(options.reverse_tsv,"classified_as_terminal_with_probabilities.tsv")
-    path_reverse = Path(path_to_file_reverse)
-
-    if path_reverse.is_file():
-        REVERSE = pd.read_csv(path_to_file_reverse, sep="\t")
-    else:
-        REVERSE = pd.DataFrame(columns=['region'])
-    
+    # Checking if the forward and reverse files have been created
+    FORWARD = read_classified_regions(options.forward_tsv)
+    REVERSE = read_classified_regions(options.reverse_tsv)
+
     # getting unique events for each file
     forward_unique = FORWARD[~FORWARD.region.isin(REVERSE.region)]
     reverse_unique = REVERSE[~REVERSE.region.isin(FORWARD.region)]
@@ -94,16 +127,9 @@ def main():
     reverse_common = REVERSE[REVERSE.region.isin(FORWARD.region)]
 
     # selecting higher terminal_probability events for common events
-    new_df = []
-
-    for index, rowf in forward_common.iterrows():
-        for index, rowr in reverse_common.iterrows():
-            if (rowr['region'] == rowf['region']) and rowr['terminal_probability'] >= rowf['terminal_probability']:
-                new_df.append(rowr)
-            elif (rowr['region'] == rowf['region']) and rowr['terminal_probability'] < rowf['terminal_probability']:
-                new_df.append(rowf)
-            
-    forward_reverse_common = pd.DataFrame(new_df)
+    forward_reverse_common = select_common_regions(
+        forward_common, reverse_common
+    )
 
     final_tsv = [forward_unique, reverse_unique, forward_reverse_common]
     result = pd.concat((final_tsv),ignore_index=True)
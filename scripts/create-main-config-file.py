@@ -163,6 +163,23 @@ def main():
         TEC_sample_new_bai_dict.append('  "' + s + '": "' + bai_path + '"')
     TEC_sample_new_bai_dict = os.linesep.join(TEC_sample_new_bai_dict)
 
+    # transcript biotypes might be provided as a YAML list as well
+    transcript_biotypes = template["transcript_biotypes"]
+    if isinstance(transcript_biotypes, list):
+        transcript_biotypes = " ".join(transcript_biotypes)
+
+    # samples of the 1st pass might be provided as a YAML list as well
+    cohort_junctions_samples = template["STAR_cohort_junctions_samples"]
+    if isinstance(cohort_junctions_samples, list):
+        cohort_junctions_samples = " ".join(
+            [str(s) for s in cohort_junctions_samples]
+        )
+
+    # chromosomes might be provided as a YAML list as well
+    annotation_chromosomes = template["annotation_chromosomes"]
+    if isinstance(annotation_chromosomes, list):
+        annotation_chromosomes = " ".join([str(c) for c in annotation_chromosomes])
+
     if template["quality_check"]:
         updated_design_table = os.path.join(
             template["nTE_directory"],
@@ -191,8 +208,34 @@ PQA_genomic_annotation: "{template["genomic_annotation"]}"
 PQA_index: "{template["genomic_index"]}"
 PQA_design_file: "{template["analysis_design_table"]}"
 PQA_sjdbOverhang: {template["sjdbOverhang"]}
-PQA_transcript_biotypes: "{template["transcript_biotypes"]}"
+PQA_STAR_shared_genome: {template["STAR_shared_genome"]}
+PQA_STAR_genome_mem_mb: {template["STAR_genome_mem_mb"]}
+PQA_STAR_align_mem_mb: {template["STAR_align_mem_mb"]}
+PQA_STAR_batches: {template["STAR_batches"]}
+PQA_STAR_cohort_junctions: {template["STAR_cohort_junctions"]}
+PQA_STAR_cohort_junctions_samples: "{cohort_junctions_samples}"
+PQA_STAR_cohort_junctions_min_unique_reads: {template["STAR_cohort_junctions_min_unique_reads"]}
+PQA_STAR_cohort_junctions_min_samples: {template["STAR_cohort_junctions_min_samples"]}
+PQA_stream_trimmed_reads: {template["stream_trimmed_reads"]}
+PQA_stream_sorted_alignments: {template["stream_sorted_alignments"]}
+PQA_samtools_sort_mem_mb: {template["samtools_sort_mem_mb"]}
+PQA_STAR_transcriptome_alignments: {template["STAR_transcriptome_alignments"]}
+PQA_remove_intermediate_files: {template["remove_intermediate_files"]}
+PQA_disk_footprint_factor: {template["disk_footprint_factor"]}
+PQA_disk_budget_gb: {template["disk_budget_gb"]}
+PQA_disk_sample_footprint_factor: {template["disk_sample_footprint_factor"]}
+PQA_transcript_biotypes: "{transcript_biotypes}"
+PQA_slim_annotation: {template["slim_annotation"]}
+PQA_annotation_chromosomes: "{annotation_chromosomes}"
 PQA_min_median_TIN_score: {template["min_median_TIN_score"]}
+PQA_TIN_out_of_core: {template["TIN_out_of_core"]}
+PQA_TIN_scores_table: {template["TIN_scores_table"]}
+PQA_coverage_cache: {template["coverage_cache"]}
+PQA_fastqc_mode: "{template["fastqc_mode"]}"
+PQA_fastqc_subsample_reads: {template["fastqc_subsample_reads"]}
+PQA_fastqc_subsample_seed: {template["fastqc_subsample_seed"]}
+PQA_per_sample_qc: {template["per_sample_qc"]}
+PQA_min_mapped_reads: {template["min_mapped_reads"]}
 PQA_RNASeQC_min_mapping_rate: {template["RNASeQC_min_mapping_rate"]}
 PQA_RNASeQC_min_unique_rate_of_mapped: {template["RNASeQC_min_unique_rate_of_mapped"]}
 PQA_RNASeQC_min_high_quality_rate: {template["RNASeQC_min_high_quality_rate"]}
@@ -214,8 +257,27 @@ TEC_new_mapped_samples_indices:
 TEC_design_file: "{updated_design_table}"
 TEC_genomic_sequence: "{template["genomic_sequence"]}"
 TEC_genomic_annotation: "{template["genomic_annotation"]}"
+TEC_slim_annotation: {template["slim_annotation"]}
 TEC_index: "{template["genomic_index"]}"
+TEC_STAR_shared_genome: {template["STAR_shared_genome"]}
+TEC_STAR_genome_mem_mb: {template["STAR_genome_mem_mb"]}
+TEC_STAR_align_mem_mb: {template["STAR_align_mem_mb"]}
+TEC_STAR_cohort_junctions: {template["STAR_cohort_junctions"]}
+TEC_reuse_preprocessing_alignments: {template["reuse_preprocessing_alignments"]}
+TEC_stream_sorted_alignments: {template["stream_sorted_alignments"]}
+TEC_samtools_sort_mem_mb: {template["samtools_sort_mem_mb"]}
+TEC_STAR_transcriptome_alignments: {template["STAR_transcriptome_alignments"]}
+TEC_remove_intermediate_files: {template["remove_intermediate_files"]}
 TEC_pas_atlas: "{template["PAS_atlas"]}"
+TEC_prune_tectool_inputs: {template["prune_tectool_inputs"]}
+TEC_prune_min_reads: {template["prune_min_reads"]}
+TEC_prune_flank: {template["prune_flank"]}
+TEC_tectool_shards: {template["tectool_shards"]}
+TEC_tectool_shard_min_training_exons: {template["tectool_shard_min_training_exons"]}
+TEC_cluster_max_distance: {template["cluster_max_distance"]}
+TEC_batch_plots: {template["batch_plots"]}
+TEC_plot_top_n: {template["plot_top_n"]}
+TEC_coverage_cache: {template["coverage_cache"]}
 TEC_storage_efficient: {template["storage_efficient"]}
 TEC_trimmed_fq: "{template["nTE_directory"]}/modules/PREPROCESSING/{default_output_dir_name}/tail_trimmed"
 TEC_bam_path: "{template["nTE_directory"]}/modules/PREPROCESSING/{default_output_dir_name}/alignment"
@@ -0,0 +1,35 @@
+"""
+##############################################################################
+#
+#   Shared setup of the tests: the helper modules of the scripts are
+#   imported as the scripts import them, from the scripts directories.
+#
+#   CREATED: 19-10-2026
+#   LICENSE: Apache_2.0
+#
+##############################################################################
+"""
+
+# imports
+import os
+import sys
+import importlib.util
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PQA_SCRIPTS = os.path.join(ROOT, "modules", "PREPROCESSING", "scripts")
+TEC_SCRIPTS = os.path.join(
+    ROOT, "modules", "TERMINAL_EXON_CHARACTERIZATION", "scripts"
+)
+
+for directory in [PQA_SCRIPTS, TEC_SCRIPTS]:
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+
+
+def load_script(path):
+    """Import a (hyphenated) script as a module, without running main()."""
+    name = os.path.splitext(os.path.basename(path))[0].replace("-", "_")
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
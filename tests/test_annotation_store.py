@@ -0,0 +1,81 @@
+"""Tests of the annotation store read instead of the GTF."""
+
+# imports
+import os
+
+import pytest
+
+from annotation_store import compile_gtf
+from conftest import TEC_SCRIPTS, load_script
+
+prune = load_script(os.path.join(TEC_SCRIPTS, "prune-tectool-inputs.py"))
+shard = load_script(os.path.join(TEC_SCRIPTS, "shard-tectool-inputs.py"))
+
+ATTRIBUTES = 'gene_id "{}"; transcript_id "{}"; gene_name "{}";'
+RECORDS = [
+    ("chr1", "gene", 100, 900, "+", "G1", None),
+    ("chr1", "transcript", 100, 900, "+", "G1", "T1"),
+    ("chr1", "exon", 100, 200, "+", "G1", "T1"),
+    ("chr1", "exon", 400, 500, "+", "G1", "T1"),
+    ("chr1", "exon", 800, 900, "+", "G1", "T1"),
+    ("chr1", "transcript", 100, 600, "+", "G1", "T2"),
+    ("chr1", "exon", 100, 200, "+", "G1", "T2"),
+    ("chr1", "exon", 550, 600, "+", "G1", "T2"),
+    ("chr2", "gene", 1000, 3000, "-", "G2", None),
+    ("chr2", "transcript", 1000, 3000, "-", "G2", "T3"),
+    ("chr2", "exon", 2500, 3000, "-", "G2", "T3"),
+    ("chr2", "exon", 1000, 1200, "-", "G2", "T3"),
+    ("chr2", "transcript", 1500, 1800, "-", "G2", "T4"),
+    ("chr2", "exon", 1500, 1800, "-", "G2", "T4"),
+]
+
+
+def write_gtf(path):
+    """Two genes: multi- and single-exon transcripts on both strands."""
+    with open(path, "w") as gtf:
+        gtf.write("#!genome-build test\n")
+        for chromosome, feature, start, end, strand, gene, transcript in RECORDS:
+            if transcript is None:
+                attributes = 'gene_id "{}"; gene_name "{}";'.format(
+                    gene, gene.lower()
+                )
+            else:
+                attributes = ATTRIBUTES.format(gene, transcript, gene.lower())
+            gtf.write("\t".join([
+                chromosome, "test", feature, str(start), str(end), ".",
+                strand, ".", attributes,
+            ]) + "\n")
+
+
+def compiled(tmp_path):
+    gtf = os.path.join(str(tmp_path), "annotation.gtf")
+    store = os.path.join(str(tmp_path), "annotation_store")
+    write_gtf(gtf)
+    compile_gtf(gtf, store)
+    return gtf, store
+
+
+def test_gene_spans(tmp_path):
+    gtf, store = compiled(tmp_path)
+    spans = prune.store_gene_spans(store)
+    assert spans == prune.read_gene_spans(gtf)
+    assert spans["G2"] == ["chr2", 999, 3000]
+
+
+def test_terminal_exons(tmp_path):
+    gtf, store = compiled(tmp_path)
+    terminal = shard.store_terminal_exons(store)
+    assert terminal == shard.read_terminal_exons(gtf)
+    assert terminal == {
+        ("chr1", 800, 900), ("chr1", 550, 600), ("chr2", 1000, 1200)
+    }
+
+
+def test_plotted_genes(tmp_path):
+    pytest.importorskip("matplotlib")
+    plot = load_script(os.path.join(TEC_SCRIPTS, "plot-novel-terminal-exons.py"))
+    gtf, store = compiled(tmp_path)
+    genes = plot.store_genes(store, {"G1", "G2", "G3", ""})
+    assert genes == plot.read_genes(gtf, {"G1", "G2", "G3", ""})
+    assert sorted(genes) == ["G1", "G2"]
+    assert genes["G2"]["transcripts"]["T3"] == [(2499, 3000), (999, 1200)]
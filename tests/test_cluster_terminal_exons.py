@@ -0,0 +1,40 @@
+"""Tests of the consensus terminal exons (cluster-terminal-exons.py)."""
+
+# imports
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from conftest import TEC_SCRIPTS
+from test_terminal_exon_index import write_results
+
+
+def test_missing_gene_id(tmp_path):
+    results = []
+    for sample, rows in [
+        ("A", [("chr7:1200000:1300000:+", "GENE1"),
+               ("chr7:1400000:1500000:+", "")]),
+        ("B", [("chr7:1200100:1300100:+", ""),
+               ("chr7:1400100:1500100:+", "")]),
+    ]:
+        os.makedirs(os.path.join(str(tmp_path), sample))
+        path = os.path.join(str(tmp_path), sample, "final_nte.tsv")
+        write_results(path, rows)
+        results.append(path)
+    consensus_tsv = os.path.join(str(tmp_path), "consensus.tsv")
+    members_tsv = os.path.join(str(tmp_path), "members.tsv")
+    subprocess.check_call([
+        sys.executable,
+        os.path.join(TEC_SCRIPTS, "cluster-terminal-exons.py"),
+        "--results", *results,
+        "--output-consensus-tsv", consensus_tsv,
+        "--output-members-tsv", members_tsv,
+    ])
+    consensus = pd.read_csv(consensus_tsv, sep="\t", keep_default_na=False)
+    assert list(consensus["region"]) == [
+        "chr7:1200000:1300100:+", "chr7:1400000:1500100:+"
+    ]
+    assert list(consensus["samples"]) == ["A,B", "A,B"]
+    assert list(consensus["gene_ids"]) == ["GENE1", ""]
@@ -0,0 +1,56 @@
+"""Tests of the cached design table (design_table.py)."""
+
+# imports
+import os
+
+from design_table import DesignTable
+
+HEADER = "sample\tfq1\tfq2\tcondition\treference\tadapter1\tadapter2\tlibrary\n"
+
+
+def write_design(path, paired_end, single_end):
+    """Design table with paired-end and single-end samples."""
+    with open(path, "w") as design:
+        design.write(HEADER)
+        for sample in paired_end:
+            design.write(
+                "{0}\t{0}_1.fastq.gz\t{0}_2.fastq.gz\tc\tc\tAAA\tCCC\t"
+                "stranded\n".format(sample)
+            )
+        for sample in single_end:
+            design.write(
+                "{0}\t{0}_1.fastq.gz\t\tc\tc\tAAA\t\tstranded\n".format(sample)
+            )
+
+
+def test_batches_keep_layouts_apart(tmp_path):
+    path = os.path.join(str(tmp_path), "design.tsv")
+    paired_end = ["P{}".format(i) for i in range(20)]
+    single_end = ["S{}".format(i) for i in range(20)]
+    write_design(path, paired_end, single_end)
+    batches = DesignTable(path).alignment_batches(3)
+    assert 2 <= len(batches) <= 6
+    assert sorted(s for group in batches.values() for s in group) == sorted(
+        paired_end + single_end
+    )
+    for batch, group in batches.items():
+        layout = set(sample[0] for sample in group)
+        assert layout == ({"P"} if batch.startswith("batch_pe_") else {"S"})
+
+
+def test_added_sample_changes_its_batch_only(tmp_path):
+    path = os.path.join(str(tmp_path), "design.tsv")
+    samples = ["cell_{}".format(i) for i in range(1, 41)]
+    write_design(path, samples, [])
+    before = DesignTable(path).alignment_batches(4)
+    write_design(path, samples + ["cell_41"], [])
+    table = DesignTable(path)
+    after = table.alignment_batches(4)
+    batch = table.alignment_batch("cell_41", 4)
+    assert after[batch] == sorted(
+        before.get(batch, []) + ["cell_41"],
+        key=lambda s: int(s.split("_")[1])
+    )
+    assert {b: g for b, g in after.items() if b != batch} == {
+        b: g for b, g in before.items() if b != batch
+    }
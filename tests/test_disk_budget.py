@@ -0,0 +1,70 @@
+"""Tests of the admission of samples against a disk budget (disk_budget.py)."""
+
+# imports
+import os
+
+from design_table import DesignTable
+from disk_budget import sample_footprints_mb, admit_samples
+
+HEADER = "sample\tfq1\tfq2\tcondition\treference\tadapter1\tadapter2\tlibrary\n"
+
+
+def write_file(path, size):
+    """File of the given size (bytes), with its directory."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as out:
+        out.write(b"0" * size)
+
+
+def write_design(tmp_dir, samples):
+    """Design table of single-end samples with 1 MB fastq files."""
+    path = os.path.join(tmp_dir, "design.tsv")
+    with open(path, "w") as design:
+        design.write(HEADER)
+        for sample in samples:
+            fastq = os.path.join(tmp_dir, "{}.fastq.gz".format(sample))
+            write_file(fastq, 1000000)
+            design.write(
+                "{}\t{}\t\tc\tc\tAAA\t\tstranded\n".format(sample, fastq)
+            )
+    return DesignTable(path)
+
+
+def test_kept_outputs_are_counted(tmp_path):
+    tmp_dir = str(tmp_path)
+    outdir = os.path.join(tmp_dir, "out")
+    design_table = write_design(tmp_dir, ["A", "B", "C", "D"])
+    # A is aligned and keeps 4 MB, B has only trimmed reads of a 1st pass
+    write_file(os.path.join(
+        outdir, "alignments", "A", "A.Aligned.out.sorted.bam"
+    ), 4000000)
+    write_file(os.path.join(
+        outdir, "alignments", "A", "A.Aligned.out.sorted.bam.bai"
+    ), 0)
+    write_file(os.path.join(outdir, "fastp_trimmed", "B.R1.fastq.gz"), 1000)
+    footprints = sample_footprints_mb(design_table, outdir, 3)
+    assert footprints["A"] == (4, True)
+    assert footprints["B"] == (3, False)
+    assert footprints["C"] == (3, False)
+    admitted, held_back = admit_samples(design_table.samples, footprints, 9)
+    assert admitted == ["A", "B"]
+    assert held_back == ["C", "D"]
+
+
+def test_started_samples_exceed_budget(tmp_path):
+    tmp_dir = str(tmp_path)
+    outdir = os.path.join(tmp_dir, "out")
+    design_table = write_design(tmp_dir, ["A", "B"])
+    write_file(os.path.join(
+        outdir, "alignments", "B", "B.Aligned.out.bam"
+    ), 8000000)
+    footprints = sample_footprints_mb(design_table, outdir, 3)
+    assert footprints["B"] == (8, True)
+    admitted, held_back = admit_samples(design_table.samples, footprints, 5)
+    assert admitted == ["B"]
+    assert held_back == ["A"]
+    # a single new sample runs if nothing else is admitted
+    footprints = sample_footprints_mb(design_table, tmp_dir, 3)
+    assert admit_samples(design_table.samples, footprints, 1) == (
+        ["A"], ["B"]
+    )
@@ -0,0 +1,69 @@
+"""Tests of the per-sample quality control (qc_checks.py)."""
+
+# imports
+import os
+import subprocess
+import sys
+
+import pandas as pd
+
+from conftest import PQA_SCRIPTS
+from qc_checks import FAIL, STAR_mapping_rates, passes_STAR, read_verdict
+from tables_star import STAR_LOG_ROWS, read_star_log
+
+
+def write_star_log(path, unique, multi, too_many):
+    """Log.final.out of STAR with the given mapping percentages."""
+    values = {
+        "Number of input reads": "10000",
+        "Uniquely mapped reads %": "{:.2f}%".format(unique),
+        "% of reads mapped to multiple loci": "{:.2f}%".format(multi),
+        "% of reads mapped to too many loci": "{:.2f}%".format(too_many),
+    }
+    with open(path, "w") as log:
+        for row in STAR_LOG_ROWS:
+            if row.endswith(":"):
+                log.write("{:>48}\n".format(row))
+            else:
+                log.write("{:>47} |\t{}\n".format(row, values.get(row, "0")))
+
+
+def test_mapping_rates(tmp_path):
+    path = os.path.join(str(tmp_path), "A.Log.final.out")
+    write_star_log(path, 60.0, 15.0, 5.0)
+    rates = STAR_mapping_rates(read_star_log(path, "A"))
+    assert abs(rates["Mapping Rate"] - 0.8) < 1e-9
+    assert abs(rates["Unique Rate of Mapped"] - 0.75) < 1e-9
+    assert passes_STAR(rates, 0.5, 0.5)
+
+
+def test_no_mapped_reads_fails(tmp_path):
+    path = os.path.join(str(tmp_path), "A.Log.final.out")
+    write_star_log(path, 0.0, 0.0, 0.0)
+    rates = STAR_mapping_rates(read_star_log(path, "A"))
+    assert rates == {"Mapping Rate": 0.0, "Unique Rate of Mapped": 0.0}
+    # also without any thresholds
+    assert not passes_STAR(rates, 0, 0)
+
+
+def test_no_mapped_reads_verdict(tmp_path):
+    star_log = os.path.join(str(tmp_path), "A.Log.final.out")
+    verdict = os.path.join(str(tmp_path), "A.verdict.tsv")
+    write_star_log(star_log, 0.0, 0.0, 0.0)
+    subprocess.check_call([
+        sys.executable,
+        os.path.join(PQA_SCRIPTS, "sample-qc-verdict.py"),
+        "--sample", "A",
+        "--star-log", star_log,
+        "--verdict-out", verdict,
+        "--min-median-TIN-cutoff", "0",
+        "--min-mapped-reads", "0",
+        "--min-mapping-rate", "0.5",
+        "--min-unique-rate-of-mapped", "0.5",
+        "--min-high-quality-rate", "0",
+        "--max-intergenic-rate", "1",
+        "--max-rRNA-rate", "1",
+    ])
+    assert read_verdict(verdict) == ("A", FAIL)
+    checks = pd.read_csv(verdict, sep="\t", keep_default_na=False)
+    assert list(checks.loc[checks["check"] == "STAR", "status"]) == [FAIL]
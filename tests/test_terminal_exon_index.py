@@ -0,0 +1,31 @@
+"""Tests of the index of the terminal exons (terminal_exon_index.py)."""
+
+# imports
+import os
+
+from terminal_exon_index import TerminalExonIndex, build_index, read_results
+
+
+def write_results(path, rows):
+    """final_nte.tsv of TECtool with the given (region, gene_id) rows."""
+    with open(path, "w") as f:
+        f.write("\tregion\tgene_id\tterminal_probability\n")
+        for i, (region, gene_id) in enumerate(rows):
+            f.write("{}\t{}\t{}\t0.9\n".format(i, region, gene_id))
+
+
+def test_missing_gene_id(tmp_path):
+    path = os.path.join(str(tmp_path), "final_nte.tsv")
+    write_results(path, [
+        ("chr7:1200000:1300000:+", "GENE1"),
+        ("chr7:1400000:1500000:+", ""),
+    ])
+    regions, skipped = read_results([("A", path)])
+    assert skipped == 0
+    assert list(regions["gene_id"]) == ["GENE1", ""]
+
+    directory = os.path.join(str(tmp_path), "index")
+    assert build_index([("A", path)], directory) == (2, 0, 0)
+    index = TerminalExonIndex(directory)
+    assert list(index.gene("GENE1")["region"]) == ["chr7:1200000:1300000:+"]
+    assert list(index.overlap("chr7", 1400000, 1400010)["gene_id"]) == [""]